@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Response cache for drafted artifact outputs.
+
+Re-running the demo after a partial failure re-dispatches every pending
+task, paying for LLM calls whose prompts have not changed. Successful
+artifact outputs are stored here, keyed by artifact type and a digest of
+the prompt (plus agent specs), so identical tasks can be replayed from disk
+instead of re-drafted.
+
+Entries live in memory for the process and as one JSON file per key under
+the cache directory; entries older than the TTL are ignored.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = Path.home() / ".contextcore" / "cache" / "responses"
+DEFAULT_TTL_SECONDS = 300
+
+
+def cache_key(artifact: str, prompt: str, *agents: str) -> str:
+    """Build a filesystem-safe key from the artifact type and prompt text."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (*agents, prompt):
+        h.update(part.encode())
+        h.update(b"\0")
+    return f"{artifact}-{h.hexdigest()}"
+
+
+class ResponseCache:
+    """In-memory dict backed by one JSON file per entry."""
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self._memory: Dict[str, Dict[str, Any]] = {}
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached content for key, or None if missing or expired."""
+        entry = self._memory.get(key)
+        if entry is None:
+            try:
+                entry = json.loads(self._path(key).read_text())
+            except (OSError, ValueError):
+                return None
+            if not isinstance(entry, dict):
+                return None
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self._memory.pop(key, None)
+            return None
+        self._memory[key] = entry
+        return entry.get("content")
+
+    def put(self, key: str, content: str) -> None:
+        """Store content under key, in memory and on disk."""
+        entry = {"key": key, "created_at": time.time(), "content": content}
+        self._memory[key] = entry
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so a crash never leaves a truncated entry
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(entry))
+        os.replace(tmp, path)
@@ -53,9 +53,22 @@ import re
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+from response_cache import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_TTL_SECONDS,
+    ResponseCache,
+    cache_key,
+)
 
 # Add paths for development (prefer environment variables if set)
 STARTD8_ROOT = os.environ.get("STARTD8_SDK_ROOT", "")
@@ -234,6 +247,13 @@ def _parse_task_artifact_key(task_id: str) -> Optional[str]:
     return parts[2]
 
 
+def _is_artifact_task(task_id: str) -> bool:
+    """True for artifact-generating tasks (not the epic or utility tasks)."""
+    return task_id.startswith("OB-") and task_id not in (
+        "OB-EPIC", "OB-LOAD", "OB-VERIFY", "OB-SUMMARY",
+    )
+
+
 def _strip_code_fences(text: str) -> str:
     """Remove markdown code fences (```json, ```yaml, etc.) from artifact text."""
     # Remove opening fences like ```json, ```yaml, ```
@@ -468,6 +488,11 @@ def _handle_raw_output(
 
 def _auto_complete_epic(task_id: str, state_dir: Path):
     """Mark an epic task as completed without dispatching to workflow."""
+    _mark_task_done(task_id, state_dir)
+
+
+def _mark_task_done(task_id: str, state_dir: Path):
+    """Set a task's state file to done without dispatching to workflow."""
     task_file = state_dir / f"{task_id}.json"
     if not task_file.exists():
         return
@@ -482,6 +507,128 @@ def _auto_complete_epic(task_id: str, state_dir: Path):
         pass
 
 
+def _transitive_dependents(tasks: List, task_ids) -> List[str]:
+    """Return IDs of tasks that depend, directly or transitively, on task_ids.
+
+    IDs are returned in input order.
+    """
+    blocked = set(task_ids)
+    dependents: set = set()
+    changed = True
+    while changed:
+        changed = False
+        for t in tasks:
+            if t.task_id in blocked:
+                continue
+            if any(d in blocked for d in (t.depends_on or ())):
+                blocked.add(t.task_id)
+                dependents.add(t.task_id)
+                changed = True
+    return [t.task_id for t in tasks if t.task_id in dependents]
+
+
+def _dependency_waves(
+    tasks: List, phase_layers: Optional[Dict[str, Any]] = None,
+) -> List[List]:
+    """Group tasks into waves whose dependencies all lie in earlier waves.
+
+    Dependencies outside the pending set (already done, or filtered out)
+    are treated as satisfied. Input order is kept within each wave.
+
+    Tasks written by setup_demo_tasks.py carry a precomputed
+    task.phase_layer, passed in as phase_layers (task ID -> layer); when
+    every task has one, waves are read from it instead of re-deriving the
+    graph.
+    """
+    phase_layers = phase_layers or {}
+    layers = [phase_layers.get(t.task_id) for t in tasks]
+    if tasks and None not in layers:
+        by_layer: Dict[int, List] = {}
+        for t, layer in zip(tasks, layers):
+            by_layer.setdefault(layer, []).append(t)
+        return [by_layer[layer] for layer in sorted(by_layer)]
+
+    pending = {t.task_id for t in tasks}
+    placed: set = set()
+    waves = []
+    remaining = list(tasks)
+    while remaining:
+        wave = [
+            t for t in remaining
+            if all(d in placed or d not in pending for d in (t.depends_on or ()))
+        ]
+        if not wave:
+            # Dependency cycle: run the rest together, as run_all would
+            wave = remaining
+        placed.update(t.task_id for t in wave)
+        waves.append(wave)
+        remaining = [t for t in remaining if t.task_id not in placed]
+    return waves
+
+
+def _run_in_waves(
+    tasks: List,
+    run_one: Callable,
+    max_parallel: int,
+    token_estimates: Dict[str, int],
+    phase_layers: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, str]]:
+    """Dispatch tasks wave by wave, up to max_parallel at a time.
+
+    run_one(task) runs a single task and returns its (results, summary).
+    Waves come from _dependency_waves(tasks, phase_layers). Within a wave,
+    tasks start in descending token_estimates order.
+    A task whose dependency failed or was skipped in this run is not
+    dispatched, matching run_all's sequential behaviour; such tasks are
+    returned in a map from task ID to the blocking dependency.
+    """
+    results: Dict[str, Any] = {}
+    summaries: List[Dict[str, Any]] = []
+    blocked: Dict[str, str] = {}
+    for wave in _dependency_waves(tasks, phase_layers):
+        ready = []
+        for t in wave:
+            dep = next((
+                d for d in (t.depends_on or ())
+                if d in blocked or (d in results and not results[d].success)
+            ), None)
+            if dep is None:
+                ready.append(t)
+            else:
+                blocked[t.task_id] = dep
+                print(f"  [SKIP] {t.task_id}: dependency {dep} did not succeed")
+        if not ready:
+            continue
+        # Each wave is a barrier, so its makespan is set by the longest
+        # task: start the largest prompts first (longest-processing-time
+        # order), using the token estimate as the cost proxy
+        ready.sort(key=lambda t: -token_estimates.get(t.task_id, 0))
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(ready))) as pool:
+            for task_results, task_summary in pool.map(run_one, ready):
+                results.update(task_results)
+                summaries.append(task_summary)
+    return results, summaries, blocked
+
+
+def _merge_summaries(
+    summaries: List[Dict[str, Any]], extra_skipped: int = 0,
+) -> Dict[str, Any]:
+    """Combine per-runner summaries into one, as if from a single run.
+
+    extra_skipped counts tasks skipped without ever reaching a runner.
+    """
+    merged = dict(summaries[0])
+    for key in ("total_tasks", "succeeded", "failed", "skipped", "total_cost"):
+        merged[key] = sum(s.get(key, 0) for s in summaries)
+    merged["total_tasks"] += extra_skipped
+    merged["skipped"] += extra_skipped
+    if all("total_tokens" in s for s in summaries):
+        merged["total_tokens"] = sum(s["total_tokens"] for s in summaries)
+    total = merged["total_tasks"]
+    merged["success_rate"] = merged["succeeded"] / total * 100 if total else 0.0
+    return merged
+
+
 def check_prerequisites() -> Dict[str, Any]:
     """Check that all prerequisites are met."""
     results = {
@@ -536,6 +683,44 @@ def check_prerequisites() -> Dict[str, Any]:
     return results
 
 
+# Rough chars-per-token ratio used when tiktoken is not installed
+_CHARS_PER_TOKEN = 4
+
+
+def _token_encoder(agent_spec: str):
+    """Return a tiktoken encoding for an agent spec like 'openai:gpt-4o-mini'.
+
+    Non-OpenAI models (e.g. Claude) have no tiktoken encoding, so fall back
+    to cl100k_base as an approximation. Returns None without tiktoken.
+    """
+    if tiktoken is None:
+        return None
+    model = agent_spec.split(":", 1)[-1]
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def estimate_prompt_tokens(tasks: List, agent_spec: str) -> Dict[str, int]:
+    """Estimate prompt tokens per task, storing the count on task.config.
+
+    Each prompt is encoded once; the result is kept under
+    "task.estimated_tokens" so later stages can reuse it.
+    """
+    encoder = _token_encoder(agent_spec)
+    estimates: Dict[str, int] = {}
+    for task in tasks:
+        prompt = task.config.get("task.prompt") or ""
+        if encoder is not None:
+            n = len(encoder.encode(prompt))
+        else:
+            n = len(prompt) // _CHARS_PER_TOKEN
+        task.config["task.estimated_tokens"] = n
+        estimates[task.task_id] = n
+    return estimates
+
+
 def _safe_metrics(r) -> Optional[Dict]:
     """Extract metrics dict from a TaskExecutionResult safely."""
     try:
@@ -565,8 +750,22 @@ def run_demo(
     max_iterations: int = 3,
     validate_jsonnet: bool = False,
     strict_validation: bool = False,
+    max_prompt_tokens: Optional[int] = None,
+    response_cache_ttl: float = 0,
+    max_parallel: int = 1,
 ) -> Dict[str, Any]:
-    """Run the self-tracking ecosystem demo."""
+    """Run the self-tracking ecosystem demo.
+
+    The response cache is opt-in: with response_cache_ttl > 0, artifact
+    tasks whose prompt (and agent specs) match a cached response younger
+    than that many seconds are replayed from the cache instead of
+    dispatched. The default of 0 dispatches every task.
+
+    With max_parallel > 1, tasks are dispatched in dependency waves and up
+    to max_parallel tasks of a wave run concurrently, each with its own
+    runner and workflow instance. As with a sequential run, tasks whose
+    dependencies failed or were skipped are not dispatched.
+    """
 
     # Import here to allow prerequisite check to work without full deps
     from startd8.integrations.contextcore import (
@@ -630,6 +829,32 @@ def run_demo(
         tasks = [t for t in tasks if t.config.get("task.phase") in phases or t.config.get("task.phase") == 0]
         print(f"Filtered to phases {phases}: {len(tasks)}/{original_count} tasks")
 
+    # Estimate prompt size once per task, before committing to execution.
+    # Cheaper tasks go first within a dependency layer, so no task moves
+    # ahead of a dependency; without layers, source order is kept.
+    token_estimates = estimate_prompt_tokens(tasks, lead_agent)
+    if all("task.phase_layer" in t.config for t in tasks):
+        tasks.sort(key=lambda t: (
+            t.config["task.phase_layer"], token_estimates[t.task_id],
+        ))
+
+    skipped_oversized: List[str] = []
+    skipped_dependents: List[str] = []
+    if max_prompt_tokens:
+        skipped_oversized = [
+            t.task_id for t in tasks
+            if token_estimates[t.task_id] > max_prompt_tokens
+        ]
+        # Tasks waiting on a skipped task cannot run either
+        skipped_dependents = _transitive_dependents(tasks, skipped_oversized)
+        dropped = set(skipped_oversized).union(skipped_dependents)
+        tasks = [t for t in tasks if t.task_id not in dropped]
+        for tid in skipped_oversized:
+            print(f"  [SKIP] {tid}: ~{token_estimates[tid]} prompt tokens "
+                  f"exceeds --max-prompt-tokens {max_prompt_tokens}")
+        for tid in skipped_dependents:
+            print(f"  [SKIP] {tid}: depends on a skipped oversized task")
+
     # Display tasks
     print(f"Found {len(tasks)} pending tasks:")
     print("-" * 70)
@@ -637,8 +862,13 @@ def run_demo(
         phase = task.config.get("task.phase", "?")
         package = task.config.get("task.package", "?")
         deps = f" (deps: {', '.join(task.depends_on)})" if task.depends_on else ""
-        print(f"  Phase {phase} [{package}] {task.task_id}: {task.title}{deps}")
+        est = token_estimates[task.task_id]
+        print(f"  Phase {phase} [{package}] {task.task_id}: {task.title}{deps}"
+              f" (~{est} tok)")
     print("-" * 70)
+    total_tokens = sum(token_estimates[t.task_id] for t in tasks)
+    estimator = "tiktoken" if tiktoken is not None else "heuristic"
+    print(f"Estimated prompt tokens: ~{total_tokens} ({estimator})")
     print()
 
     # Dry run mode
@@ -658,6 +888,9 @@ def run_demo(
             "dry_run": True,
             "tasks": [t.task_id for t in tasks],
             "validate_jsonnet": validate_jsonnet,
+            "estimated_tokens": total_tokens,
+            "skipped_oversized": skipped_oversized,
+            "skipped_dependents": skipped_dependents,
         }
 
     # Confirm if not forced
@@ -681,12 +914,26 @@ def run_demo(
         return {"error": "No workflow tasks"}
 
     tasks = workflow_tasks
-    print(f"Dispatching {len(tasks)} tasks to workflow "
-          f"({len(epic_tasks)} epic(s) auto-completed)")
-    print()
 
-    # Set up workflow
-    workflow = LeadContractorWorkflow()
+    # Response cache keys are computed before the config is rewritten below
+    response_cache = None
+    cache_keys: Dict[str, str] = {}
+    if response_cache_ttl > 0:
+        response_cache = ResponseCache(
+            DEFAULT_CACHE_DIR / DEMO_PROJECT, response_cache_ttl,
+        )
+        cache_keys = {
+            t.task_id: cache_key(
+                _parse_task_artifact_key(t.task_id) or t.task_id,
+                t.config.get("task.prompt") or "",
+                lead_agent, drafter_agent,
+            )
+            for t in tasks if _is_artifact_task(t.task_id)
+        }
+
+    # Like cache keys, phase layers for --parallel waves are read before the
+    # config rewrite below drops task.phase_layer
+    phase_layers = {t.task_id: t.config.get("task.phase_layer") for t in tasks}
 
     # Inject agent configuration into tasks
     for task in tasks:
@@ -699,13 +946,6 @@ def run_demo(
         # to catch incomplete artifact generation early.
         task.config = config
 
-    # Create runner
-    runner = ContextCoreTaskRunner(
-        project_id=DEMO_PROJECT,
-        sprint_id=DEMO_SPRINT,
-        emit_insights=True,
-    )
-
     # Track artifact counts
     artifact_counts: Dict[str, int] = {}
 
@@ -759,6 +999,77 @@ def run_demo(
             elif t.config.get("service_name"):
                 _task_service_names[tid] = [t.config["service_name"]]
 
+    def _validation_note(task_id: str, svc_names: Optional[List[str]]) -> str:
+        """Run Jsonnet checkpoints on a task's saved params; return a status note."""
+        if not (validate_jsonnet and jsonnet_checkpoint) or "-RUNBOOKS" in task_id:
+            return ""
+        try:
+            # Get the params files that were saved
+            artifact_key = _parse_task_artifact_key(task_id)
+            if not (artifact_key and svc_names):
+                return ""
+            params_files = [
+                PARAMS_DIR / f"{svc}-params.libsonnet"
+                for svc in svc_names
+                if (PARAMS_DIR / f"{svc}-params.libsonnet").exists()
+            ]
+            if not params_files:
+                return ""
+            checkpoint_results = jsonnet_checkpoint.run_all_checkpoints(
+                params_files, task_id
+            )
+            passed = all(
+                r.status.value in ("passed", "skipped", "warning")
+                for r in checkpoint_results
+            )
+            if passed:
+                return " [validation: OK]"
+            failed_count = sum(
+                1 for r in checkpoint_results
+                if r.status.value == "failed"
+            )
+            # Log errors for debugging
+            for r in checkpoint_results:
+                if r.status.value == "failed":
+                    for err in r.errors[:2]:
+                        print(f"      {r.name}: {err}")
+            return f" [validation: {failed_count} failed]"
+        except Exception as val_exc:
+            return f" [validation error: {val_exc}]"
+
+    # Replay artifact tasks with a cached response instead of dispatching
+    cached_tasks: List[str] = []
+    if response_cache is not None:
+        for t in tasks:
+            key = cache_keys.get(t.task_id)
+            content = response_cache.get(key) if key else None
+            if content is None:
+                continue
+            svc_names = _task_service_names.get(t.task_id)
+            saved = _split_and_save_artifacts(
+                t.task_id, content, service_names=svc_names,
+            )
+            if saved == 0:
+                # Unusable entry: dispatch the task as if it were not cached
+                continue
+            artifact_counts[t.task_id] = saved
+            _mark_task_done(t.task_id, state_dir)
+            cached_tasks.append(t.task_id)
+            note = _validation_note(t.task_id, svc_names)
+            print(f"  [CACHED] {t.task_id}: [{saved} artifacts saved]{note}")
+        if cached_tasks:
+            served = set(cached_tasks)
+            tasks = [t for t in tasks if t.task_id not in served]
+            print()
+
+    if tasks:
+        print(f"Dispatching {len(tasks)} tasks to workflow "
+              f"({len(epic_tasks)} epic(s) auto-completed, "
+              f"{len(cached_tasks)} served from cache)")
+    else:
+        print("All workflow tasks were served from the response cache.")
+    print()
+
     # Progress callback with artifact extraction
     # IMPORTANT: The runner does NOT wrap this in try/except -- any unhandled
     # exception here will crash the entire run.  Guard everything.
@@ -793,9 +1104,7 @@ def run_demo(
                 if content is None:
                     content = getattr(result.result, 'final_implementation', None)
 
-            if content and task_id.startswith("OB-") and task_id not in (
-                "OB-EPIC", "OB-LOAD", "OB-VERIFY", "OB-SUMMARY",
-            ):
+            if content and _is_artifact_task(task_id):
                 try:
                     svc_names = _task_service_names.get(task_id)
                     saved = _split_and_save_artifacts(
@@ -808,41 +1117,14 @@ def run_demo(
                             msg += f" [{saved} artifacts saved] [WARN: {saved}/{expected} services - check for truncation]"
                         else:
                             msg += f" [{saved} artifacts saved]"
-
-                        # Run Jsonnet validation checkpoints if enabled
-                        if validate_jsonnet and jsonnet_checkpoint and "-RUNBOOKS" not in task_id:
-                            try:
-                                # Get the params files that were saved
-                                artifact_key = _parse_task_artifact_key(task_id)
-                                if artifact_key and svc_names:
-                                    params_files = [
-                                        PARAMS_DIR / f"{svc}-params.libsonnet"
-                                        for svc in svc_names
-                                        if (PARAMS_DIR / f"{svc}-params.libsonnet").exists()
-                                    ]
-                                    if params_files:
-                                        checkpoint_results = jsonnet_checkpoint.run_all_checkpoints(
-                                            params_files, task_id
-                                        )
-                                        passed = all(
-                                            r.status.value in ("passed", "skipped", "warning")
-                                            for r in checkpoint_results
-                                        )
-                                        failed_count = sum(
-                                            1 for r in checkpoint_results
-                                            if r.status.value == "failed"
-                                        )
-                                        if passed:
-                                            msg += " [validation: OK]"
-                                        else:
-                                            msg += f" [validation: {failed_count} failed]"
-                                            # Log errors for debugging
-                                            for r in checkpoint_results:
-                                                if r.status.value == "failed":
-                                                    for err in r.errors[:2]:
-                                                        print(f"      {r.name}: {err}")
-                            except Exception as val_exc:
-                                msg += f" [validation error: {val_exc}]"
+                            # Only complete outputs are worth replaying
+                            key = cache_keys.get(task_id)
+                            if response_cache is not None and key:
+                                try:
+                                    response_cache.put(key, content)
+                                except OSError as exc:
+                                    print(f"  [WARN] {task_id}: response cache write failed: {exc}")
+                        msg += _validation_note(task_id, svc_names)
                     else:
                         msg += " [0 artifacts - no delimiters matched]"
                 except Exception as exc:
@@ -869,21 +1151,60 @@ def run_demo(
     print()
 
     start_time = datetime.now()
+    blocked: Dict[str, str] = {}
 
-    # Run all tasks
-    results = runner.run_all(
-        tasks=tasks,
-        workflow=workflow,
-        on_task_complete=on_task_complete,
-        stop_on_failure=False,  # Continue even if a task fails
-    )
+    if not tasks:
+        results = {}
+        summary = {
+            "project_id": DEMO_PROJECT,
+            "sprint_id": DEMO_SPRINT,
+            "total_tasks": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "skipped": 0,
+            "success_rate": 100.0,
+            "total_cost": 0.0,
+        }
+    elif max_parallel > 1:
+        # LLM calls dominate wall time, so independent tasks (e.g. artifact
+        # families of the same tier) are dispatched concurrently
+        def run_one(task):
+            task_runner = ContextCoreTaskRunner(
+                project_id=DEMO_PROJECT,
+                sprint_id=DEMO_SPRINT,
+                emit_insights=True,
+            )
+            task_results = task_runner.run_all(
+                tasks=[task],
+                workflow=LeadContractorWorkflow(),
+                on_task_complete=on_task_complete,
+                stop_on_failure=False,
+            )
+            return task_results, task_runner.get_summary()
+
+        results, summaries, blocked = _run_in_waves(
+            tasks, run_one, max_parallel, token_estimates, phase_layers,
+        )
+        summary = _merge_summaries(summaries, extra_skipped=len(blocked))
+    else:
+        workflow = LeadContractorWorkflow()
+        runner = ContextCoreTaskRunner(
+            project_id=DEMO_PROJECT,
+            sprint_id=DEMO_SPRINT,
+            emit_insights=True,
+        )
+        # Run all tasks
+        results = runner.run_all(
+            tasks=tasks,
+            workflow=workflow,
+            on_task_complete=on_task_complete,
+            stop_on_failure=False,  # Continue even if a task fails
+        )
+        summary = runner.get_summary()
 
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
 
-    # Get summary
-    summary = runner.get_summary()
-
     # Print results
     print()
     print("=" * 70)
@@ -897,6 +1218,7 @@ def run_demo(
     print(f"  ✅ Succeeded: {summary['succeeded']}")
     print(f"  ❌ Failed: {summary['failed']}")
     print(f"  ⏭️  Skipped: {summary['skipped']}")
+    print(f"  💾 Served from cache: {len(cached_tasks)}")
     print()
     print(f"Success Rate: {summary['success_rate']:.1f}%")
     print(f"Total LLM Cost: ${summary['total_cost']:.4f}")
@@ -938,6 +1260,7 @@ def run_demo(
                 "output_dir": str(OUTPUT_DIR),
                 "per_task": artifact_counts,
             },
+            "cached_tasks": cached_tasks,
             "results": {
                 task_id: {
                     "success": r.success,
@@ -949,6 +1272,14 @@ def run_demo(
                 for task_id, r in results.items()
             }
         }
+        for task_id, dep in blocked.items():
+            output_data["results"][task_id] = {
+                "success": False,
+                "skipped": True,
+                "error": None,
+                "skip_reason": f"Dependency {dep} did not succeed",
+                "metrics": None,
+            }
         with open(output_file, 'w') as f:
             json.dump(output_data, f, indent=2, default=str)
         print(f"Results saved to: {output_file}")
@@ -957,6 +1288,9 @@ def run_demo(
         "success": summary['success_rate'] == 100,
         "summary": summary,
         "duration_seconds": duration,
+        "cached_tasks": cached_tasks,
+        "skipped_oversized": skipped_oversized,
+        "skipped_dependents": skipped_dependents,
     }
 
 
@@ -1028,6 +1362,24 @@ def main():
         action="store_true",
         help="Fail on validation warnings (use with --validate-jsonnet)"
     )
+    parser.add_argument(
+        "--max-prompt-tokens",
+        type=int,
+        help="Skip tasks whose estimated prompt exceeds this many tokens"
+    )
+    parser.add_argument(
+        "--response-cache-ttl",
+        type=float,
+        default=0,
+        help="Replay artifact outputs cached within this many seconds, "
+             f"e.g. {DEFAULT_TTL_SECONDS} (default: 0, cache disabled)"
+    )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="Dispatch up to N independent tasks concurrently (default: 1)"
+    )
 
     args = parser.parse_args()
 
@@ -1081,6 +1433,9 @@ def main():
             max_iterations=args.max_iterations,
             validate_jsonnet=args.validate_jsonnet,
             strict_validation=args.strict_validation,
+            max_prompt_tokens=args.max_prompt_tokens,
+            response_cache_ttl=args.response_cache_ttl,
+            max_parallel=args.parallel,
         )
 
         if result.get("error") or result.get("aborted"):
@@ -119,8 +119,21 @@ check_prerequisites() {
         all_ok=false
     fi
 
+    # Probe the stack concurrently (each probe can take seconds to time
+    # out); results are collected below in the usual order
+    curl -sf "${GRAFANA_URL}/api/health" > /dev/null 2>&1 &
+    local grafana_pid=$!
+    curl -sf "${TEMPO_URL}/ready" > /dev/null 2>&1 &
+    local tempo_pid=$!
+    curl -sf "${LOKI_URL}/ready" > /dev/null 2>&1 &
+    local loki_pid=$!
+    nc -z localhost 4317 2>/dev/null &
+    local otlp_pid=$!
+    nc -z localhost 14317 2>/dev/null &
+    local otlp_alt_pid=$!
+
     # Check Grafana
-    if curl -sf "${GRAFANA_URL}/api/health" > /dev/null 2>&1; then
+    if wait "$grafana_pid"; then
         log_ok "Grafana healthy: $GRAFANA_URL"
     else
         log_fail "Grafana not reachable: $GRAFANA_URL"
@@ -128,7 +141,7 @@ check_prerequisites() {
     fi
 
     # Check Tempo
-    if curl -sf "${TEMPO_URL}/ready" > /dev/null 2>&1; then
+    if wait "$tempo_pid"; then
         log_ok "Tempo healthy: $TEMPO_URL"
     else
         log_fail "Tempo not reachable: $TEMPO_URL"
@@ -136,19 +149,20 @@ check_prerequisites() {
     fi
 
     # Check Loki
-    if curl -sf "${LOKI_URL}/ready" > /dev/null 2>&1; then
+    if wait "$loki_pid"; then
         log_ok "Loki healthy: $LOKI_URL"
     else
         log_warn "Loki not reachable: $LOKI_URL (LogQL queries will not work)"
     fi
 
-    # Check OTLP endpoint
+    # Check OTLP endpoint (4317 preferred over 14317)
     local otlp_port=""
-    if nc -z localhost 4317 2>/dev/null; then
-        otlp_port=4317
-    elif nc -z localhost 14317 2>/dev/null; then
+    if wait "$otlp_alt_pid"; then
         otlp_port=14317
     fi
+    if wait "$otlp_pid"; then
+        otlp_port=4317
+    fi
 
     if [ -n "$otlp_port" ]; then
         log_ok "OTLP endpoint: localhost:$otlp_port"
@@ -273,50 +287,44 @@ import_dashboards() {
     local imported=0
     local errors=0
 
-    # Import from demo/dashboards/
-    if [ -d "$CONTEXTCORE_DIR/demo/dashboards" ]; then
-        for dashboard in "$CONTEXTCORE_DIR"/demo/dashboards/*.json; do
-            [ -f "$dashboard" ] || continue
-            local name
-            name=$(basename "$dashboard")
-            local result
-            result=$(curl -sf -X POST \
-                -H "Content-Type: application/json" \
-                -u "$GRAFANA_AUTH" \
-                -d "{\"dashboard\": $(cat "$dashboard"), \"overwrite\": true}" \
-                "${GRAFANA_URL}/api/dashboards/db" 2>/dev/null || echo "ERROR")
-
-            if echo "$result" | grep -q "success\|uid"; then
-                log_info "Imported: $name"
-                ((imported++))
-            else
-                log_warn "Failed to import: $name"
-                ((errors++))
+    # Collect from demo/dashboards/ and grafana/provisioning/dashboards/json/;
+    # unmatched globs are skipped by the -f test
+    local dashboards=()
+    local dashboard
+    for dashboard in "$CONTEXTCORE_DIR"/demo/dashboards/*.json \
+                     "$CONTEXTCORE_DIR"/grafana/provisioning/dashboards/json/*.json; do
+        [ -f "$dashboard" ] && dashboards+=("$dashboard")
+    done
+
+    if [ "${#dashboards[@]}" -gt 0 ]; then
+        # One curl process imports every dashboard: operations separated by
+        # "next" reuse a single keep-alive connection to Grafana, and each
+        # prints "<http_code> <index>" for the result loop below
+        local tmp
+        tmp=$(mktemp -d)
+        local i=0
+        for dashboard in "${dashboards[@]}"; do
+            printf '{"dashboard": %s, "overwrite": true}' "$(cat "$dashboard")" > "$tmp/$i.json"
+            if [ "$i" -gt 0 ]; then
+                echo "next"
             fi
-        done
-    fi
-
-    # Import from grafana/provisioning/dashboards/json/
-    if [ -d "$CONTEXTCORE_DIR/grafana/provisioning/dashboards/json" ]; then
-        for dashboard in "$CONTEXTCORE_DIR"/grafana/provisioning/dashboards/json/*.json; do
-            [ -f "$dashboard" ] || continue
-            local name
-            name=$(basename "$dashboard")
-            local result
-            result=$(curl -sf -X POST \
-                -H "Content-Type: application/json" \
-                -u "$GRAFANA_AUTH" \
-                -d "{\"dashboard\": $(cat "$dashboard"), \"overwrite\": true}" \
-                "${GRAFANA_URL}/api/dashboards/db" 2>/dev/null || echo "ERROR")
-
-            if echo "$result" | grep -q "success\|uid"; then
+            printf 'url = "%s/api/dashboards/db"\nheader = "Content-Type: application/json"\nuser = "%s"\ndata = "@%s"\noutput = "/dev/null"\nsilent\nwrite-out = "%%{http_code} %s\\n"\n' \
+                "$GRAFANA_URL" "$GRAFANA_AUTH" "$tmp/$i.json" "$i"
+            i=$((i + 1))
+        done > "$tmp/curl.cfg"
+
+        local code name
+        while read -r code i; do
+            name=$(basename "${dashboards[$i]}")
+            if [ "$code" = "200" ]; then
                 log_info "Imported: $name"
-                ((imported++))
+                imported=$((imported + 1))
             else
                 log_warn "Failed to import: $name"
-                ((errors++))
+                errors=$((errors + 1))
             fi
-        done
+        done < <(curl --config "$tmp/curl.cfg" 2>/dev/null || true)
+        rm -rf "$tmp"
     fi
 
     if [ "$imported" -gt 0 ]; then
@@ -387,8 +395,10 @@ verify_setup() {
     fi
 
     # Check demo task files
-    local task_count
-    task_count=$(ls ~/.contextcore/state/ecosystem-demo/*.json 2>/dev/null | wc -l | tr -d ' ')
+    # Count with a glob in the shell instead of an ls | wc | tr pipeline
+    local task_files=(~/.contextcore/state/ecosystem-demo/*.json)
+    local task_count=0
+    [ -e "${task_files[0]}" ] && task_count=${#task_files[@]}
 
     if [ "$task_count" -gt 0 ]; then
         log_ok "Demo tasks: $task_count"
@@ -24,15 +24,21 @@ After running this script, execute the demo with:
 """
 
 import argparse
+import functools
+import hashlib
 import json
 import os
 import re
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple, TypedDict
-import uuid
+from types import MappingProxyType
+from typing import (
+    Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple,
+    TypedDict,
+)
 
 
 # =============================================================================
@@ -71,6 +77,7 @@ class ServiceContext(TypedDict, total=False):
     - Proto definitions (gRPC methods)
     """
     name: str
+    tier: Optional[str]
     language: str
     description: str
     criticality: str  # critical, high, medium, low
@@ -83,11 +90,28 @@ class ServiceContext(TypedDict, total=False):
     owner: str
     k8s: K8sConfig
 
+
+class PromptSegment(TypedDict):
+    """A slice of a prompt; cache=True marks a reusable (cacheable) prefix."""
+    text: str
+    cache: bool
+
 try:
     import yaml
 except ImportError:
     yaml = None
 
+# Prefer the libyaml-backed loader; the pure-Python one is ~10x slower.
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    _SafeLoader = yaml.SafeLoader if yaml is not None else None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -95,6 +119,15 @@ except ImportError:
 DEMO_PROJECT = "ecosystem-demo"
 DEMO_SPRINT = "demo-sprint-1"
 STATE_DIR = Path.home() / ".contextcore" / "state" / DEMO_PROJECT
+# Single-file export written by --manifest: one task document per line
+# (JSONL). Kept outside STATE_DIR because ContextCoreTaskSource treats every
+# *.json in STATE_DIR as one task.
+MANIFEST_FILE = STATE_DIR.parent / f"{DEMO_PROJECT}-tasks.jsonl"
+# Task ids/phases from the last setup run, used to skip regeneration on
+# re-runs when no data source has changed (also kept outside STATE_DIR).
+SCAN_CACHE_FILE = STATE_DIR.parent / f".{DEMO_PROJECT}-scan.json"
+# Extracted CRD/K8s fields per YAML file, keyed by path and mtime
+YAML_CACHE_FILE = STATE_DIR.parent / f".{DEMO_PROJECT}-yaml-cache.json"
 
 _SCRIPT_DIR = Path(__file__).resolve().parent
 _PROJECT_DIR = _SCRIPT_DIR.parent
@@ -102,6 +135,7 @@ _DEFAULT_DEV_ROOT = _PROJECT_DIR.parent
 
 DEV_ROOT = Path(os.environ.get("CONTEXTCORE_DEV_ROOT", str(_DEFAULT_DEV_ROOT)))
 OUTPUT_DIR = _PROJECT_DIR / "output" / "observability"
+_OUTPUT_STR = str(OUTPUT_DIR)
 
 # Paths to data sources
 CRD_DIR = DEV_ROOT / "ContextCore" / "demo" / "projectcontexts"
@@ -114,7 +148,7 @@ K8S_DIR = (DEV_ROOT / "micro-service-demo" / "microservices-demo"
 # SERVICE METADATA (standalone -- no contextcore dependency required)
 # =============================================================================
 
-SERVICE_INFO = {
+SERVICE_INFO = MappingProxyType({
     "frontend": {
         "language": "Go",
         "description": "HTTP server delivering the website interface",
@@ -177,20 +211,25 @@ SERVICE_INFO = {
         "description": "Simulates user shopping behavior with Locust",
         "dependencies": ["frontend"],
     },
-}
+})
 
 # Service tier assignments
-TIER_MAP = {
+TIER_MAP = MappingProxyType({
     "critical": ["frontend", "checkoutservice", "cartservice", "paymentservice"],
     "high": ["productcatalogservice", "currencyservice", "shippingservice"],
     "medium": ["emailservice", "recommendationservice", "adservice"],
     "low": ["loadgenerator"],
-}
+})
+
 
 # Reverse lookup: service name -> tier
-SERVICE_TO_TIER = {
+SERVICE_TO_TIER = MappingProxyType({
     svc: tier for tier, services in TIER_MAP.items() for svc in services
-}
+})
+
+# Service name lists as rendered in the verify prompt
+_ALL_SERVICES_CSV = ", ".join(SERVICE_INFO)
+_SERVICES_NO_LG_CSV = ", ".join(s for s in SERVICE_INFO if s != "loadgenerator")
 
 # Task decomposition setting: True = 1 service per task (reliable), False = batch by tier
 # Setting to True fixes truncation issues with GPT-4o-mini when batching 3+ services
@@ -225,25 +264,27 @@ LOADGEN_ARTIFACTS = [ARTIFACT_DASHBOARD, ARTIFACT_RUNBOOK]
 
 # Tier task configurations: phase ordering, gating dependencies, artifact types
 # Used by batched mode (_generate_batched_tasks) when DECOMPOSE_TO_SINGLE_SERVICE=False
+# gate_deps are tuples, like every generated depends_on, so all tasks in a
+# tier can share them
 TIER_CONFIGS = [
     {
         "name": "critical", "prefix": "CRIT", "phase": 1,
-        "gate_deps": [],
+        "gate_deps": (),
         "artifacts": STANDARD_ARTIFACTS,
     },
     {
         "name": "high", "prefix": "HIGH", "phase": 2,
-        "gate_deps": ["OB-CRIT-DASHBOARDS"],
+        "gate_deps": ("OB-CRIT-DASHBOARDS",),
         "artifacts": STANDARD_ARTIFACTS,
     },
     {
         "name": "medium", "prefix": "MED", "phase": 3,
-        "gate_deps": ["OB-HIGH-DASHBOARDS"],
+        "gate_deps": ("OB-HIGH-DASHBOARDS",),
         "artifacts": STANDARD_ARTIFACTS,
     },
     {
         "name": "low", "prefix": "LOW", "phase": 4,
-        "gate_deps": ["OB-MED-DASHBOARDS"],
+        "gate_deps": ("OB-MED-DASHBOARDS",),
         "artifacts": LOADGEN_ARTIFACTS,
     },
 ]
@@ -270,6 +311,11 @@ ARTIFACT_OUTPUT_CONFIG = {
     "RUNBOOK": {"dir": "runbooks", "suffix": "runbook", "ext": "md"},
 }
 
+# Delimiters the prompts ask the drafter to emit: jsonnet-compiled artifacts
+# come back as PARAMS sections, runbooks as raw Markdown RUNBOOK sections
+PARAMS_DELIMITER = "PARAMS"
+RUNBOOK_DELIMITER = "RUNBOOK"
+
 # Map task artifact key to the delimiter used in drafter output
 ARTIFACT_KEY_TO_DELIMITER = {
     "DASHBOARDS": "DASHBOARD",
@@ -287,37 +333,182 @@ ARTIFACT_KEY_TO_DELIMITER = {
 # =============================================================================
 
 
+def _load_yaml_cache(script_mtime: int) -> Dict[str, Any]:
+    """Read the extracted-fields cache, or an empty dict if unusable.
+
+    Entries hold the output of the parsers defined in this script, so the
+    whole cache is discarded when the script's mtime differs.
+    """
+    try:
+        data = YAML_CACHE_FILE.read_bytes()
+        cache = orjson.loads(data) if orjson is not None else json.loads(data)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("script_mtime") != script_mtime:
+        return {}
+    entries = cache.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+# Extraction cache updated by this process but not yet written; read-only
+# modes (--dry-run, --list) never persist it, see _save_yaml_cache()
+_yaml_cache_pending: Optional[Dict[str, Any]] = None
+
+
+def _save_yaml_cache() -> None:
+    """Write pending extraction-cache updates to YAML_CACHE_FILE."""
+    global _yaml_cache_pending
+    if _yaml_cache_pending is None:
+        return
+    try:
+        YAML_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _write_encoded(YAML_CACHE_FILE, _encode_json({
+            "script_mtime": Path(__file__).stat().st_mtime_ns,
+            "entries": _yaml_cache_pending,
+        }))
+    except (OSError, TypeError, ValueError):
+        # Non-JSON YAML values or an unwritable home: just don't cache
+        pass
+    _yaml_cache_pending = None
+
+
+def _yaml_files(directory: Path, skip: Tuple[str, ...] = ()) -> List[Path]:
+    """List *.yaml files in directory with one scandir pass, sorted by name.
+
+    Listing stats nothing; _parse_yaml_files stats each returned path once
+    for its cache stamp. Sorting plain names keeps the output deterministic
+    for callers that key results by file order.
+    """
+    with os.scandir(directory) as it:
+        names = [
+            e.name for e in it
+            if e.name.endswith(".yaml") and e.name not in skip
+        ]
+    names.sort()
+    return [directory / name for name in names]
+
+
+def _parse_yaml_files(
+    paths: List[Path], parse_one: Callable[[Path], Optional[Dict]],
+) -> Dict[str, Dict]:
+    """Run parse_one over YAML files concurrently, keyed by file stem.
+
+    Files are independent, so reads and parses are spread over a thread
+    pool. Results keep the order of ``paths``; files for which parse_one
+    returns None are dropped.
+
+    Extracted results are cached in YAML_CACHE_FILE per (parser, path,
+    mtime, size), so unchanged files are not re-parsed on later runs.
+    Entries of this parser for files no longer listed are pruned. Updates
+    stay in memory until _save_yaml_cache() writes them.
+    """
+    global _yaml_cache_pending
+    cache = _yaml_cache_pending
+    if cache is None:
+        cache = _load_yaml_cache(Path(__file__).stat().st_mtime_ns)
+    prefix = f"{parse_one.__name__}:"
+    keys = [f"{prefix}{path}" for path in paths]
+    listed = set(keys)
+    stale = [k for k in cache if k.startswith(prefix) and k not in listed]
+    for key in stale:
+        del cache[key]
+
+    stamps = []
+    for path in paths:
+        st = path.stat()
+        stamps.append([st.st_mtime_ns, st.st_size])
+
+    results: List[Optional[Dict]] = [None] * len(paths)
+    misses = []
+    for i, key in enumerate(keys):
+        entry = cache.get(key)
+        if isinstance(entry, dict) and entry.get("stamp") == stamps[i]:
+            results[i] = entry.get("info")
+        else:
+            misses.append(i)
+
+    if misses:
+        workers = min(len(misses), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            parsed = pool.map(parse_one, [paths[i] for i in misses])
+            for i, info in zip(misses, parsed):
+                results[i] = info
+                cache[keys[i]] = {"stamp": stamps[i], "info": info}
+    if misses or stale:
+        _yaml_cache_pending = cache
+
+    return {
+        path.stem: info
+        for path, info in zip(paths, results)
+        if info is not None
+    }
+
+
+def _parse_project_context(yaml_file: Path) -> Optional[Dict]:
+    """Parse one ProjectContext CRD YAML, or None if it cannot be read."""
+    try:
+        doc = yaml.load(yaml_file.read_text(), Loader=_SafeLoader)
+    except Exception:
+        return None
+
+    spec = doc.get("spec", {})
+    biz = spec.get("business", {})
+    reqs = spec.get("requirements", {})
+    obs = spec.get("observability", {})
+
+    return {
+        "criticality": biz.get("criticality", "medium"),
+        "value": biz.get("value", "internal"),
+        "owner": biz.get("owner", "unknown"),
+        "availability": reqs.get("availability", "-"),
+        "latency_p99": reqs.get("latencyP99", "-"),
+        "error_budget": reqs.get("errorBudget", "-"),
+        "throughput": reqs.get("throughput", "-"),
+        "risks": spec.get("risks", []),
+        "alert_channels": obs.get("alertChannels", []),
+    }
+
+
 def load_project_contexts() -> Dict[str, Dict]:
     """Parse all ProjectContext CRD YAMLs, return dict keyed by service name."""
     if yaml is None or not CRD_DIR.exists():
         return {}
 
-    contexts = {}
-    for yaml_file in sorted(CRD_DIR.glob("*.yaml")):
-        try:
-            doc = yaml.safe_load(yaml_file.read_text())
-        except Exception:
-            continue
+    return _parse_yaml_files(_yaml_files(CRD_DIR), _parse_project_context)
 
-        service_name = yaml_file.stem
-        spec = doc.get("spec", {})
-        biz = spec.get("business", {})
-        reqs = spec.get("requirements", {})
-        obs = spec.get("observability", {})
-
-        contexts[service_name] = {
-            "criticality": biz.get("criticality", "medium"),
-            "value": biz.get("value", "internal"),
-            "owner": biz.get("owner", "unknown"),
-            "availability": reqs.get("availability", "-"),
-            "latency_p99": reqs.get("latencyP99", "-"),
-            "error_budget": reqs.get("errorBudget", "-"),
-            "throughput": reqs.get("throughput", "-"),
-            "risks": spec.get("risks", []),
-            "alert_channels": obs.get("alertChannels", []),
-        }
 
-    return contexts
+_SERVICE_HEAD_RE = re.compile(r'service\s+(\w+)\s*\{')
+_RPC_RE = re.compile(r'rpc\s+(\w+)\s*\(')
+
+
+def _service_bodies(content: str):
+    """Yield (proto_name, body) for each top-level ``service`` block.
+
+    Bodies are delimited by counting braces in a single forward pass, so
+    nested ``{}`` option blocks are handled without regex backtracking.
+    """
+    pos = 0
+    while True:
+        head = _SERVICE_HEAD_RE.search(content, pos)
+        if head is None:
+            return
+        start = end = head.end()
+        depth = 1
+        while depth:
+            open_at = content.find("{", end)
+            close_at = content.find("}", end)
+            if close_at < 0:
+                # Unterminated block: take the rest of the file
+                yield head.group(1), content[start:]
+                return
+            if 0 <= open_at < close_at:
+                depth += 1
+                end = open_at + 1
+            else:
+                depth -= 1
+                end = close_at + 1
+        yield head.group(1), content[start:end - 1]
+        pos = end
 
 
 def load_proto_definitions() -> Dict[str, List[str]]:
@@ -328,81 +519,67 @@ def load_proto_definitions() -> Dict[str, List[str]]:
     content = PROTO_FILE.read_text()
     services: Dict[str, List[str]] = {}
 
-    service_re = re.compile(
-        r'service\s+(\w+)\s*\{(.*?)^\}',
-        re.DOTALL | re.MULTILINE,
-    )
-    rpc_re = re.compile(r'rpc\s+(\w+)\s*\(')
-
-    for match in service_re.finditer(content):
-        proto_name = match.group(1)
-        body = match.group(2)
-        methods = rpc_re.findall(body)
+    for proto_name, body in _service_bodies(content):
         # "CartService" -> "cartservice"
-        service_key = proto_name.lower()
-        services[service_key] = methods
+        services[proto_name.lower()] = _RPC_RE.findall(body)
 
     return services
 
 
-def load_k8s_manifests() -> Dict[str, Dict]:
-    """Parse K8s manifest YAMLs, extract ports, resources, health probes."""
-    if yaml is None or not K8S_DIR.exists():
-        return {}
-
-    manifests: Dict[str, Dict] = {}
-    skip_files = {"kustomization.yaml", "README.md"}
+# Probe handler key -> probe_type label, checked in order for each probe
+_PROBE_KEYS = ("readinessProbe", "livenessProbe")
+_PROBE_KINDS = (("httpGet", "http"), ("grpc", "grpc"), ("exec", "exec"))
 
-    for yaml_file in sorted(K8S_DIR.glob("*.yaml")):
-        if yaml_file.name in skip_files:
-            continue
 
-        service_name = yaml_file.stem
-        try:
-            docs = list(yaml.safe_load_all(yaml_file.read_text()))
-        except Exception:
-            continue
+def _parse_k8s_manifest(yaml_file: Path) -> Optional[Dict]:
+    """Parse one K8s manifest YAML, or None if it cannot be read."""
+    try:
+        docs = list(yaml.load_all(yaml_file.read_text(), Loader=_SafeLoader))
+    except Exception:
+        return None
 
-        info: Dict[str, Any] = {
-            "port": None, "resources": {}, "probe_type": None,
-        }
-
-        for doc in docs:
-            if not isinstance(doc, dict) or doc.get("kind") != "Deployment":
-                continue
-
-            containers = (
-                doc.get("spec", {})
-                .get("template", {})
-                .get("spec", {})
-                .get("containers", [])
-            )
-            if not containers:
-                continue
-
-            c = containers[0]
+    info: Dict[str, Any] = {
+        "port": None, "resources": {}, "probe_type": None,
+    }
 
-            ports = c.get("ports", [])
-            if ports:
-                info["port"] = ports[0].get("containerPort")
+    deployment = next(
+        (d for d in docs
+         if isinstance(d, dict) and d.get("kind") == "Deployment"),
+        None,
+    )
+    containers = (
+        deployment.get("spec", {})
+        .get("template", {})
+        .get("spec", {})
+        .get("containers", [])
+    ) if deployment else []
+
+    if containers:
+        c = containers[0]
+
+        ports = c.get("ports", [])
+        if ports:
+            info["port"] = ports[0].get("containerPort")
+
+        info["resources"] = c.get("resources", {})
+        info["probe_type"] = next(
+            (label
+             for probe_key in _PROBE_KEYS
+             for kind, label in _PROBE_KINDS
+             if kind in c.get(probe_key, {})),
+            None,
+        )
 
-            info["resources"] = c.get("resources", {})
+    return info
 
-            for probe_key in ("readinessProbe", "livenessProbe"):
-                probe = c.get(probe_key, {})
-                if "httpGet" in probe:
-                    info["probe_type"] = "http"
-                    break
-                elif "grpc" in probe:
-                    info["probe_type"] = "grpc"
-                    break
-                elif "exec" in probe:
-                    info["probe_type"] = "exec"
-                    break
 
-        manifests[service_name] = info
+def load_k8s_manifests() -> Dict[str, Dict]:
+    """Parse K8s manifest YAMLs, extract ports, resources, health probes."""
+    if yaml is None or not K8S_DIR.exists():
+        return {}
 
-    return manifests
+    yaml_files = _yaml_files(K8S_DIR, skip=("kustomization.yaml",))
+    return _parse_yaml_files(yaml_files, _parse_k8s_manifest)
 
 
 # =============================================================================
@@ -410,6 +587,17 @@ def load_k8s_manifests() -> Dict[str, Dict]:
 # =============================================================================
 
 
+def _normalize_risks(risks: List[Any]) -> List[RiskConfig]:
+    """Coerce CRD risk entries to {priority, description} dicts."""
+    return [
+        {"priority": r.get("priority", "?"),
+         "description": r.get("description", "")}
+        if isinstance(r, dict)
+        else {"priority": "?", "description": str(r)}
+        for r in risks
+    ]
+
+
 def build_service_context(
     service_name: str,
     crd: Optional[Dict],
@@ -423,6 +611,7 @@ def build_service_context(
 
     return {
         "name": service_name,
+        "tier": SERVICE_TO_TIER.get(service_name),
         "language": info.get("language", "unknown"),
         "description": info.get("description", ""),
         "criticality": crd.get("criticality", "medium"),
@@ -435,7 +624,7 @@ def build_service_context(
             "error_budget": crd.get("error_budget", "-"),
             "throughput": crd.get("throughput", "-"),
         },
-        "risks": crd.get("risks", []),
+        "risks": _normalize_risks(crd.get("risks", [])),
         "alert_channels": crd.get("alert_channels", []),
         "owner": crd.get("owner", "unknown"),
         "k8s": {
@@ -446,8 +635,14 @@ def build_service_context(
     }
 
 
+@functools.lru_cache(maxsize=1)
 def build_all_contexts() -> Dict[str, Dict]:
-    """Load all data sources and build unified service contexts."""
+    """Load all data sources and build unified service contexts.
+
+    The result is cached for the process and shared by every caller, so
+    treat it as read-only. Use clear_context_cache() after changing the
+    data-source paths.
+    """
     crds = load_project_contexts()
     proto = load_proto_definitions()
     k8s = load_k8s_manifests()
@@ -464,15 +659,34 @@ def build_all_contexts() -> Dict[str, Dict]:
 
 
 def group_by_tier(contexts: Dict[str, Dict]) -> Dict[str, List[Dict]]:
-    """Group service contexts by criticality tier."""
-    tiers: Dict[str, List[Dict]] = {}
-    for tier_name, services in TIER_MAP.items():
-        tiers[tier_name] = [
-            contexts[s] for s in services if s in contexts
-        ]
+    """Group service contexts by criticality tier.
+
+    Single pass over the contexts using the tier recorded on each one;
+    services keep their order in ``contexts``, and every tier in TIER_MAP
+    is present even when empty.
+    """
+    tiers: Dict[str, List[Dict]] = {tier_name: [] for tier_name in TIER_MAP}
+    for name, ctx in contexts.items():
+        tier = ctx.get("tier") or SERVICE_TO_TIER.get(name)
+        if tier in tiers:
+            tiers[tier].append(ctx)
     return tiers
 
 
+@functools.lru_cache(maxsize=1)
+def _all_tiers() -> Dict[str, List[Dict]]:
+    """Cached group_by_tier() over the cached build_all_contexts()."""
+    return group_by_tier(build_all_contexts())
+
+
+def clear_context_cache() -> None:
+    """Drop cached contexts and tasks so the next build reloads data sources."""
+    build_all_contexts.cache_clear()
+    _all_tiers.cache_clear()
+    _service_body_cache.clear()
+    _build_task_list.cache_clear()
+
+
 # =============================================================================
 # JSONNET PARAMETER SCHEMA TEMPLATE
 # =============================================================================
@@ -539,19 +753,45 @@ Do NOT use Grafonnet or any library imports - just plain data.
 # PROMPT HELPERS
 # =============================================================================
 
+# Separators shared by every prompt layout
+_SEP2 = "\n\n"
+_SERVICE_HDR = "\n\n## Service\n\n"
+_SERVICES_HDR = "\n\n## Services\n\n"
+
+
+# Rendered service block bodies keyed by service name. Each entry keeps the
+# context it was rendered from, so a different context for the same service
+# is re-rendered; cleared by clear_context_cache().
+_service_body_cache: Dict[str, Tuple[Dict, str]] = {}
+
 
 def _format_service_block(ctx: Dict, index: int) -> str:
-    """Format a single service's context for inclusion in a prompt."""
+    """Format a single service's context for inclusion in a prompt.
+
+    The index-independent body is rendered once per context and cached in
+    _service_body_cache, so repeat renders across artifact prompts only add
+    the heading.
+    """
+    return f"### {index}. {_service_body(ctx)}"
+
+
+def _service_body(ctx: Dict) -> str:
+    """Return the cached index-independent service block body."""
+    entry = _service_body_cache.get(ctx["name"])
+    if entry is None or entry[0] is not ctx:
+        entry = (ctx, _render_service_body(ctx))
+        _service_body_cache[ctx["name"]] = entry
+    return entry[1]
+
+
+def _render_service_body(ctx: Dict) -> str:
+    """Render a service block without its numbered heading prefix."""
     methods = ", ".join(ctx.get("grpc_methods", [])) or "N/A (HTTP gateway)"
     deps = ", ".join(ctx.get("dependencies", [])) or "none"
 
-    risk_strs = []
-    for r in ctx.get("risks", []):
-        if isinstance(r, dict):
-            risk_strs.append(
-                f"{r.get('priority', '?')}: {r.get('description', '')}"
-            )
-    risks = "; ".join(risk_strs) or "none identified"
+    risks = "; ".join([
+        f"{r['priority']}: {r['description']}" for r in ctx.get("risks", [])
+    ]) or "none identified"
     channels = ", ".join(ctx.get("alert_channels", [])) or "none"
 
     slo = ctx.get("slo", {})
@@ -560,39 +800,41 @@ def _format_service_block(ctx: Dict, index: int) -> str:
     req = res.get("requests", {})
     lim = res.get("limits", {})
 
-    lines = [
-        f"### {index}. {ctx['name']} ({ctx['language']})",
-        f"- Description: {ctx['description']}",
-        f"- Criticality: {ctx['criticality']} | Value: {ctx['business_value']}",
-        f"- gRPC Methods: {methods}",
-        (f"- SLO: availability={slo.get('availability', '-')}%, "
-         f"latencyP99={slo.get('latency_p99', '-')}, "
-         f"errorBudget={slo.get('error_budget', '-')}%, "
-         f"throughput={slo.get('throughput', '-')}"),
-        f"- Dependencies: {deps}",
-        f"- Risks: {risks}",
-        f"- Alert Channels: {channels}",
-        (f"- K8s: port={k8s.get('port', '-')}, "
-         f"requests={req.get('cpu', '-')}/{req.get('memory', '-')}, "
-         f"limits={lim.get('cpu', '-')}/{lim.get('memory', '-')}, "
-         f"probes={k8s.get('probe_type', '-')}"),
-    ]
-    return "\n".join(lines)
+    return (
+        f"{ctx['name']} ({ctx['language']})\n"
+        f"- Description: {ctx['description']}\n"
+        f"- Criticality: {ctx['criticality']} | Value: {ctx['business_value']}\n"
+        f"- gRPC Methods: {methods}\n"
+        f"- SLO: availability={slo.get('availability', '-')}%, "
+        f"latencyP99={slo.get('latency_p99', '-')}, "
+        f"errorBudget={slo.get('error_budget', '-')}%, "
+        f"throughput={slo.get('throughput', '-')}\n"
+        f"- Dependencies: {deps}\n"
+        f"- Risks: {risks}\n"
+        f"- Alert Channels: {channels}\n"
+        f"- K8s: port={k8s.get('port', '-')}, "
+        f"requests={req.get('cpu', '-')}/{req.get('memory', '-')}, "
+        f"limits={lim.get('cpu', '-')}/{lim.get('memory', '-')}, "
+        f"probes={k8s.get('probe_type', '-')}"
+    )
 
 
 def _services_section(service_contexts: List[Dict]) -> str:
     """Format all service blocks for a prompt."""
-    return "\n\n".join(
+    return _SEP2.join([
         _format_service_block(ctx, i + 1)
         for i, ctx in enumerate(service_contexts)
-    )
+    ])
 
 
-def _output_format_section(
-    n: int, delimiter: str, service_contexts: List[Dict],
-) -> str:
+def _service_names_csv(service_contexts: List[Dict]) -> str:
+    """Comma-separated service names used in output-format sections."""
+    return ", ".join(ctx["name"] for ctx in service_contexts)
+
+
+@functools.lru_cache(maxsize=256)
+def _output_format_section(n: int, delimiter: str, names: str) -> str:
     """Build the standard output-format section for a prompt (raw JSON/YAML)."""
-    names = ", ".join(ctx["name"] for ctx in service_contexts)
     return (
         "## Output Format\n\n"
         f"Output {n} artifact(s), each separated by a delimiter line:\n\n"
@@ -603,13 +845,17 @@ def _output_format_section(
     )
 
 
-def _params_output_format_section(n: int, service_contexts: List[Dict]) -> str:
-    """Build the output-format section for PARAMS (.libsonnet) output."""
-    names = ", ".join(ctx["name"] for ctx in service_contexts)
+@functools.lru_cache(maxsize=256)
+def _params_output_format_section(n: int, delimiter: str, names: str) -> str:
+    """Build the output-format section for PARAMS (.libsonnet) output.
+
+    Arguments are hashable, so results are memoized: the same (count,
+    delimiter, names) combination recurs for every PARAMS artifact type.
+    """
     return (
         "## Output Format\n\n"
         f"Output {n} parameter file(s), each separated by a delimiter line:\n\n"
-        "--- PARAMS: {service_name} ---\n\n"
+        f"--- {delimiter}: {{service_name}} ---\n\n"
         f"Where {{service_name}} is one of: {names}\n\n"
         "Output ONLY the raw Jsonnet object between delimiters. "
         "No markdown code fences inside the delimited sections.\n"
@@ -651,14 +897,19 @@ _ARTIFACT_DESCRIPTIONS = {
     ),
 }
 
-# Requirements per artifact type (shared between batched and single-service prompts)
+# Requirement lines repeated verbatim across artifact families
+_REQ_OWNER = "Set owner from the service context"
+_REQ_PROTOCOL = "Set protocol to 'http' for frontend, 'grpc' for others"
+
+# Requirements per artifact type (shared between batched and single-service
+# prompts; worded per service since each parameter file covers one service)
 _ARTIFACT_REQUIREMENTS = {
     ARTIFACT_DASHBOARDS: [
         "Set criticality, protocol (grpc/http), and SLO targets accurately",
         "For HTTP services (frontend): set protocol to 'http'",
         "Include all gRPC methods from the service context",
         "Include dependencies as listed in the service context",
-        "Set owner from the service context",
+        _REQ_OWNER,
         "Include risks with priority and description",
         "Set k8s.port from the service context",
         "Use the correct log field names for the service's language",
@@ -666,23 +917,23 @@ _ARTIFACT_REQUIREMENTS = {
     ARTIFACT_ALERTS: [
         "Set SLO availability and latencyP99 targets accurately",
         "Set criticality correctly (determines alert severity and 'for' duration)",
-        "Set protocol to 'http' for frontend, 'grpc' for others",
+        _REQ_PROTOCOL,
         "Include all risks from the service context",
         "Set alertChannels for alert routing",
-        "Set owner from the service context",
+        _REQ_OWNER,
     ],
     ARTIFACT_SLOS: [
         "Set slo.availability from the service's availability target",
         "Set slo.latencyP99 from the service's latency target (with 'ms' suffix)",
         "Set slo.errorBudget = 100 - availability (e.g., 99.95 -> 0.05)",
-        "Set owner from the service context",
+        _REQ_OWNER,
         "Set criticality correctly (affects alert severity)",
-        "Set protocol to 'http' for frontend, 'grpc' for others",
+        _REQ_PROTOCOL,
     ],
     ARTIFACT_NOTIFY: [
         "Set alertChannels from the service's context",
         "Set criticality correctly (determines routing)",
-        "Set owner from the service context",
+        _REQ_OWNER,
         "If alertChannels is empty, use defaults based on criticality:\n"
         "   - critical: ['pagerduty-p1', 'slack-incidents']\n"
         "   - high: ['slack-incidents']\n"
@@ -702,406 +953,361 @@ _ARTIFACT_REQUIREMENTS = {
 }
 
 
-def _build_requirements_section(artifact_key: str) -> str:
-    """Build requirements section from shared config."""
-    reqs = _ARTIFACT_REQUIREMENTS.get(artifact_key, [])
+def _format_reqs(reqs: List[str]) -> str:
+    """Number requirement lines under a "## Requirements" heading."""
     lines = [f"{i+1}. {req}" for i, req in enumerate(reqs)]
     return "## Requirements\n\n" + "\n".join(lines) + "\n"
 
 
+def _build_requirements_section(artifact_key: str) -> str:
+    """Build requirements section from shared config."""
+    return _format_reqs(_ARTIFACT_REQUIREMENTS.get(artifact_key, []))
+
+
+def _stable_prefix(reference: str, summary: str, reqs: str) -> str:
+    """Build the static leading block of an artifact prompt.
+
+    Reference material comes first, then the artifact summary and the
+    requirements. Everything that varies per call (tier, service, counts)
+    follows this prefix, so provider-side prompt caches can reuse it across
+    every task of the same artifact family.
+    """
+    return f"{reference.lstrip()}\n{summary}\n\n{reqs}\n"
+
+
+def _params_summary(artifact_key: str) -> str:
+    """One-line description of what a PARAMS file is compiled into."""
+    return (
+        "These parameters will be compiled into "
+        f"{_ARTIFACT_DESCRIPTIONS[artifact_key][1]}."
+    )
+
+
 def _build_params_prompt(
     artifact_key: str,
     header: str,
     service_section: str,
 ) -> str:
     """Build a complete PARAMS prompt with shared structure."""
-    reqs = _build_requirements_section(artifact_key)
-    return (
-        f"{header}\n\n{service_section}\n\n"
-        f"{PARAMS_SCHEMA_TEMPLATE}\n{reqs}\n"
-    )
+    return "".join([
+        _ARTIFACT_PROMPTS[artifact_key].prefix, header, _SEP2,
+        service_section, _SEP2,
+    ])
 
 
 # =============================================================================
-# PROMPT BUILDERS (one per artifact type)
+# PROMPT BUILDERS (table-driven, one row per artifact type)
 # =============================================================================
+# Every prompt opens with its artifact family's stable prefix (reference
+# schema/template, summary, requirements) and ends with the per-call part:
+# task header, service context and output format.
+#
+# Batched builders take the tier's service count, rendered service blocks and
+# service-name list precomputed once per tier, since every artifact type for
+# a tier embeds the same service context. Each batched prompt is assembled
+# into a format template once at import, so a call is a single str.format.
 
 
-def build_dashboard_prompt(tier_name: str, ctxs: List[Dict]) -> str:
-    n = len(ctxs)
-    header = (
-        f"Generate {n} Jsonnet parameter file(s) for Grafana dashboards "
-        f"for {tier_name}-tier Online Boutique microservices.\n\n"
-        "These parameters will be compiled into dashboards with panels for: "
-        "request rate (QPS), latency percentiles (P50/P95/P99), error rate (%), "
-        "availability (%), resource saturation (CPU/memory), and dependency health."
+def _batched_template(prefix: str, header: str) -> str:
+    """Assemble a batched prompt template from its stable prefix and header.
+
+    The prefix is brace-escaped, leaving only {n}, {tier_name}, {services}
+    and {output_format} as fields.
+    """
+    static = prefix.replace("{", "{{").replace("}", "}}")
+    return f"{static}{header}{_SERVICES_HDR}{{services}}{_SEP2}{{output_format}}"
+
+
+_RUNBOOK_TEMPLATE = (
+    "## Reference Template\n\n"
+    "```markdown\n"
+    "# SERVICE_NAME Operational Runbook\n\n"
+    "## Service Overview\n"
+    "| Field | Value |\n"
+    "|-------|-------|\n"
+    "| Language | LANG |\n"
+    "| Criticality | TIER |\n"
+    "| Owner | OWNER |\n"
+    "| Port | PORT |\n\n"
+    "## SLOs\n"
+    "| Metric | Target |\n"
+    "|--------|--------|\n"
+    "| Availability | X% |\n"
+    "| Latency P99 | Yms |\n\n"
+    "## Alert Response\n"
+    "### SERVICE_NAMELatencyP99High\n"
+    "**Severity**: warning | **Threshold**: ... \n"
+    "**Steps**: 1. Check... 2. Scale... 3. Escalate...\n\n"
+    "## Kubernetes Commands\n"
+    "```bash\n"
+    "kubectl get pods -l app=SERVICE_NAME -n online-boutique\n"
+    "kubectl logs -l app=SERVICE_NAME -n online-boutique --tail=100\n"
+    "kubectl rollout restart deployment/SERVICE_NAME -n online-boutique\n"
+    "```\n\n"
+    "## Dependencies\n"
+    "...\n\n"
+    "## Escalation\n"
+    "1. On-call: CHANNEL\n"
+    "2. Team lead: OWNER\n"
+    "```\n"
+)
+
+_RUNBOOK_REQS = _format_reqs([
+    "Include all SLO targets from the service context",
+    "List every risk with its priority and mitigation",
+    "Include kubectl commands for: pod status, logs, restart, describe, top",
+    "Alert response section for each alert type (latency, error rate)",
+    "Dependency health checks: how to verify each upstream is OK",
+    "Escalation path using the service's alertChannels",
+])
+
+_RUNBOOK_SUMMARY = (
+    "Each runbook covers: service overview, SLOs, alert response, "
+    "K8s commands, dependencies, risks, and escalation."
+)
+
+
+class _ArtifactPrompt(NamedTuple):
+    """Everything needed to build one artifact type's prompts."""
+    prefix: str              # stable prefix shared by batched and single
+    batched_template: str    # str.format template, see _batched_template
+    single_header: str       # str.format_map template over the service ctx
+    output_format: Callable[[int, str, str], str]
+    delimiter: str
+
+
+def _params_artifact(
+    key: str, qualifier: str = "{criticality} criticality",
+) -> _ArtifactPrompt:
+    """Build the prompt table row for a PARAMS (.libsonnet) artifact."""
+    noun = _ARTIFACT_DESCRIPTIONS[key][0]
+    prefix = _stable_prefix(
+        PARAMS_SCHEMA_TEMPLATE, _params_summary(key),
+        _build_requirements_section(key),
+    )
+    return _ArtifactPrompt(
+        prefix=prefix,
+        batched_template=_batched_template(
+            prefix,
+            f"Generate {{n}} Jsonnet parameter file(s) for {noun} "
+            "for {tier_name}-tier Online Boutique microservices.",
+        ),
+        single_header=(
+            f"Generate 1 Jsonnet parameter file for {noun} "
+            f"for the {{name}} microservice ({qualifier})."
+        ),
+        output_format=_params_output_format_section,
+        delimiter=PARAMS_DELIMITER,
     )
 
-    reqs = (
-        "## Requirements\n\n"
-        "1. Set criticality, protocol (grpc/http), and SLO targets accurately\n"
-        "2. For HTTP services (frontend): set protocol to 'http'\n"
-        "3. Include all gRPC methods from the service context\n"
-        "4. Include dependencies as listed in the service context\n"
-        "5. Set owner from the service context\n"
-        "6. Include risks with priority and description\n"
-        "7. Set k8s.port from the service context\n"
-        "8. Use the correct log field names for each service's language\n"
+
+_RUNBOOK_PREFIX = _stable_prefix(_RUNBOOK_TEMPLATE, _RUNBOOK_SUMMARY, _RUNBOOK_REQS)
+
+# Artifact key -> prompt table row (DASHBOARD/RUNBOOK alias the plural keys)
+_ARTIFACT_PROMPTS: Dict[str, _ArtifactPrompt] = {
+    ARTIFACT_DASHBOARDS: _params_artifact(ARTIFACT_DASHBOARDS),
+    ARTIFACT_ALERTS: _params_artifact(ARTIFACT_ALERTS),
+    ARTIFACT_SLOS: _params_artifact(ARTIFACT_SLOS),
+    ARTIFACT_NOTIFY: _params_artifact(ARTIFACT_NOTIFY),
+    # Loki rules use language instead of criticality in header
+    ARTIFACT_LOKI_RULES: _params_artifact(
+        ARTIFACT_LOKI_RULES, qualifier="{language}",
+    ),
+    ARTIFACT_RUNBOOKS: _ArtifactPrompt(
+        prefix=_RUNBOOK_PREFIX,
+        batched_template=_batched_template(
+            _RUNBOOK_PREFIX,
+            "Generate {n} operational runbook(s) in Markdown for "
+            "{tier_name}-tier Online Boutique microservices.",
+        ),
+        single_header=(
+            "Generate 1 operational runbook in Markdown for "
+            "the {name} microservice ({criticality} criticality)."
+        ),
+        output_format=_output_format_section,
+        delimiter=RUNBOOK_DELIMITER,
+    ),
+}
+_ARTIFACT_PROMPTS[ARTIFACT_DASHBOARD] = _ARTIFACT_PROMPTS[ARTIFACT_DASHBOARDS]
+_ARTIFACT_PROMPTS[ARTIFACT_RUNBOOK] = _ARTIFACT_PROMPTS[ARTIFACT_RUNBOOKS]
+
+
+def build_batched_prompt(
+    artifact_key: str,
+    tier_name: str, n: int, services_block: str, names: str,
+) -> str:
+    """Build the tier-batched prompt for one artifact type."""
+    spec = _ARTIFACT_PROMPTS[artifact_key]
+    return spec.batched_template.format(
+        n=n, tier_name=tier_name, services=services_block,
+        output_format=spec.output_format(n, spec.delimiter, names),
     )
 
-    return (
-        f"{header}\n\n## Services\n\n{_services_section(ctxs)}\n\n"
-        f"{PARAMS_SCHEMA_TEMPLATE}\n{reqs}\n"
-        f"{_params_output_format_section(n, ctxs)}"
+
+def _build_tier_prompt(
+    artifact_key: str, tier_name: str, ctxs: List[Dict],
+) -> str:
+    """Build the tier-batched prompt for one artifact type from contexts."""
+    return build_batched_prompt(
+        artifact_key, tier_name, len(ctxs),
+        _services_section(ctxs), _service_names_csv(ctxs),
     )
 
 
+def build_single_service_prompt(artifact_key: str, ctx: Dict) -> str:
+    """Build the single-service prompt for one artifact type."""
+    spec = _ARTIFACT_PROMPTS[artifact_key]
+    return "".join([
+        spec.prefix, spec.single_header.format_map(ctx),
+        _SERVICE_HDR, _format_service_block(ctx, 1), _SEP2,
+        spec.output_format(1, spec.delimiter, ctx["name"]),
+    ])
+
+
+def build_dashboard_prompt(tier_name: str, ctxs: List[Dict]) -> str:
+    return _build_tier_prompt(ARTIFACT_DASHBOARDS, tier_name, ctxs)
+
+
 def build_single_service_dashboard_prompt(ctx: Dict) -> str:
     """Build dashboard prompt for a single service."""
-    desc = _ARTIFACT_DESCRIPTIONS[ARTIFACT_DASHBOARDS]
-    header = (
-        f"Generate 1 Jsonnet parameter file for a {desc[0]} "
-        f"for the {ctx['name']} microservice ({ctx['criticality']} criticality).\n\n"
-        f"These parameters will be compiled into {desc[1]}."
-    )
-    service_section = f"## Service\n\n{_format_service_block(ctx, 1)}"
-    reqs = _build_requirements_section(ARTIFACT_DASHBOARDS)
-    return (
-        f"{header}\n\n{service_section}\n\n"
-        f"{PARAMS_SCHEMA_TEMPLATE}\n{reqs}\n"
-        f"{_params_output_format_section(1, [ctx])}"
-    )
+    return build_single_service_prompt(ARTIFACT_DASHBOARDS, ctx)
 
 
 def build_alerts_prompt(tier_name: str, ctxs: List[Dict]) -> str:
-    n = len(ctxs)
-    header = (
-        f"Generate {n} Jsonnet parameter file(s) for PrometheusRule alerts "
-        f"for {tier_name}-tier Online Boutique microservices.\n\n"
-        "These parameters will be compiled into alerting rules derived from "
-        "SLO targets: latency P99 alerts and error rate alerts."
-    )
-
-    reqs = (
-        "## Requirements\n\n"
-        "1. Set SLO availability and latencyP99 targets accurately\n"
-        "2. Set criticality correctly (determines alert severity and 'for' duration)\n"
-        "3. Set protocol to 'http' for frontend, 'grpc' for others\n"
-        "4. Include all risks from the service context\n"
-        "5. Set alertChannels for alert routing\n"
-        "6. Set owner from the service context\n"
-    )
-
-    return (
-        f"{header}\n\n## Services\n\n{_services_section(ctxs)}\n\n"
-        f"{PARAMS_SCHEMA_TEMPLATE}\n{reqs}\n"
-        f"{_params_output_format_section(n, ctxs)}"
-    )
+    return _build_tier_prompt(ARTIFACT_ALERTS, tier_name, ctxs)
 
 
 def build_single_service_alerts_prompt(ctx: Dict) -> str:
     """Build alerts prompt for a single service."""
-    desc = _ARTIFACT_DESCRIPTIONS[ARTIFACT_ALERTS]
-    header = (
-        f"Generate 1 Jsonnet parameter file for {desc[0]} "
-        f"for the {ctx['name']} microservice ({ctx['criticality']} criticality).\n\n"
-        f"These parameters will be compiled into {desc[1]}."
-    )
-    service_section = f"## Service\n\n{_format_service_block(ctx, 1)}"
-    reqs = _build_requirements_section(ARTIFACT_ALERTS)
-    return (
-        f"{header}\n\n{service_section}\n\n"
-        f"{PARAMS_SCHEMA_TEMPLATE}\n{reqs}\n"
-        f"{_params_output_format_section(1, [ctx])}"
-    )
+    return build_single_service_prompt(ARTIFACT_ALERTS, ctx)
 
 
 def build_slo_prompt(tier_name: str, ctxs: List[Dict]) -> str:
-    n = len(ctxs)
-    header = (
-        f"Generate {n} Jsonnet parameter file(s) for SLO definitions "
-        f"for {tier_name}-tier Online Boutique microservices.\n\n"
-        "These parameters will be compiled into Sloth PrometheusServiceLevel "
-        "definitions with availability targets and multi-window burn-rate alerting."
-    )
-
-    reqs = (
-        "## Requirements\n\n"
-        "1. Set slo.availability from each service's availability target\n"
-        "2. Set slo.latencyP99 from each service's latency target (with 'ms' suffix)\n"
-        "3. Set slo.errorBudget = 100 - availability (e.g., 99.95 -> 0.05)\n"
-        "4. Set owner from the service context\n"
-        "5. Set criticality correctly (affects alert severity)\n"
-        "6. Set protocol to 'http' for frontend, 'grpc' for others\n"
-    )
-
-    return (
-        f"{header}\n\n## Services\n\n{_services_section(ctxs)}\n\n"
-        f"{PARAMS_SCHEMA_TEMPLATE}\n{reqs}\n"
-        f"{_params_output_format_section(n, ctxs)}"
-    )
+    return _build_tier_prompt(ARTIFACT_SLOS, tier_name, ctxs)
 
 
 def build_single_service_slo_prompt(ctx: Dict) -> str:
     """Build SLO prompt for a single service."""
-    desc = _ARTIFACT_DESCRIPTIONS[ARTIFACT_SLOS]
-    header = (
-        f"Generate 1 Jsonnet parameter file for {desc[0]} "
-        f"for the {ctx['name']} microservice ({ctx['criticality']} criticality).\n\n"
-        f"These parameters will be compiled into {desc[1]}."
-    )
-    service_section = f"## Service\n\n{_format_service_block(ctx, 1)}"
-    reqs = _build_requirements_section(ARTIFACT_SLOS)
-    return (
-        f"{header}\n\n{service_section}\n\n"
-        f"{PARAMS_SCHEMA_TEMPLATE}\n{reqs}\n"
-        f"{_params_output_format_section(1, [ctx])}"
-    )
+    return build_single_service_prompt(ARTIFACT_SLOS, ctx)
 
 
 def build_notification_prompt(tier_name: str, ctxs: List[Dict]) -> str:
-    n = len(ctxs)
-    header = (
-        f"Generate {n} Jsonnet parameter file(s) for notification policies "
-        f"for {tier_name}-tier Online Boutique microservices.\n\n"
-        "These parameters will be compiled into notification routing policies "
-        "based on criticality: critical -> PagerDuty, high -> Slack, "
-        "medium -> email, low -> log only."
-    )
-
-    reqs = (
-        "## Requirements\n\n"
-        "1. Set alertChannels from each service's context\n"
-        "2. Set criticality correctly (determines routing)\n"
-        "3. Set owner from the service context\n"
-        "4. If alertChannels is empty, use defaults based on criticality:\n"
-        "   - critical: ['pagerduty-p1', 'slack-incidents']\n"
-        "   - high: ['slack-incidents']\n"
-        "   - medium: ['slack-notifications', 'email-oncall']\n"
-        "   - low: ['slack-notifications']\n"
-    )
-
-    return (
-        f"{header}\n\n## Services\n\n{_services_section(ctxs)}\n\n"
-        f"{PARAMS_SCHEMA_TEMPLATE}\n{reqs}\n"
-        f"{_params_output_format_section(n, ctxs)}"
-    )
+    return _build_tier_prompt(ARTIFACT_NOTIFY, tier_name, ctxs)
 
 
 def build_single_service_notification_prompt(ctx: Dict) -> str:
     """Build notification prompt for a single service."""
-    desc = _ARTIFACT_DESCRIPTIONS[ARTIFACT_NOTIFY]
-    header = (
-        f"Generate 1 Jsonnet parameter file for {desc[0]} "
-        f"for the {ctx['name']} microservice ({ctx['criticality']} criticality).\n\n"
-        f"These parameters will be compiled into {desc[1]}."
-    )
-    service_section = f"## Service\n\n{_format_service_block(ctx, 1)}"
-    reqs = _build_requirements_section(ARTIFACT_NOTIFY)
-    return (
-        f"{header}\n\n{service_section}\n\n"
-        f"{PARAMS_SCHEMA_TEMPLATE}\n{reqs}\n"
-        f"{_params_output_format_section(1, [ctx])}"
-    )
+    return build_single_service_prompt(ARTIFACT_NOTIFY, ctx)
 
 
 def build_loki_rules_prompt(tier_name: str, ctxs: List[Dict]) -> str:
-    n = len(ctxs)
-    header = (
-        f"Generate {n} Jsonnet parameter file(s) for Loki recording rules "
-        f"for {tier_name}-tier Online Boutique microservices.\n\n"
-        "These parameters will be compiled into Loki RecordingRules that "
-        "derive Prometheus metrics from structured JSON logs: "
-        "error counts, latency, and request counts."
-    )
-
-    reqs = (
-        "## Requirements\n\n"
-        "1. Set language correctly for each service\n"
-        "2. Set logFields with the correct field names for each language:\n"
-        "   - Go: level='level', message='msg', duration='duration_ms', durationUnit='ms'\n"
-        "   - Node.js: level='level', message='message', duration='responseTime', durationUnit='ms'\n"
-        "   - Python: level='levelname', message='message', duration='duration', durationUnit='ms'\n"
-        "   - Java: level='level', message='message', duration='elapsed_ms', durationUnit='ms'\n"
-        "   - C#: level='Level', message='Message', duration='ElapsedMilliseconds', durationUnit='ms'\n"
-        "3. Set criticality from the service context\n"
-    )
-
-    return (
-        f"{header}\n\n## Services\n\n{_services_section(ctxs)}\n\n"
-        f"{PARAMS_SCHEMA_TEMPLATE}\n{reqs}\n"
-        f"{_params_output_format_section(n, ctxs)}"
-    )
+    return _build_tier_prompt(ARTIFACT_LOKI_RULES, tier_name, ctxs)
 
 
 def build_single_service_loki_rules_prompt(ctx: Dict) -> str:
     """Build Loki rules prompt for a single service."""
-    desc = _ARTIFACT_DESCRIPTIONS[ARTIFACT_LOKI_RULES]
-    # Loki rules use language instead of criticality in header
-    header = (
-        f"Generate 1 Jsonnet parameter file for {desc[0]} "
-        f"for the {ctx['name']} microservice ({ctx['language']}).\n\n"
-        f"These parameters will be compiled into {desc[1]}."
-    )
-    service_section = f"## Service\n\n{_format_service_block(ctx, 1)}"
-    reqs = _build_requirements_section(ARTIFACT_LOKI_RULES)
-    return (
-        f"{header}\n\n{service_section}\n\n"
-        f"{PARAMS_SCHEMA_TEMPLATE}\n{reqs}\n"
-        f"{_params_output_format_section(1, [ctx])}"
-    )
+    return build_single_service_prompt(ARTIFACT_LOKI_RULES, ctx)
 
 
 def build_runbook_prompt(tier_name: str, ctxs: List[Dict]) -> str:
-    n = len(ctxs)
-    header = (
-        f"Generate {n} operational runbook(s) in Markdown for "
-        f"{tier_name}-tier Online Boutique microservices.\n\n"
-        "Each runbook covers: service overview, SLOs, alert response, "
-        "K8s commands, dependencies, risks, and escalation."
-    )
+    return _build_tier_prompt(ARTIFACT_RUNBOOKS, tier_name, ctxs)
 
-    template = (
-        "## Reference Template\n\n"
-        "```markdown\n"
-        "# SERVICE_NAME Operational Runbook\n\n"
-        "## Service Overview\n"
-        "| Field | Value |\n"
-        "|-------|-------|\n"
-        "| Language | LANG |\n"
-        "| Criticality | TIER |\n"
-        "| Owner | OWNER |\n"
-        "| Port | PORT |\n\n"
-        "## SLOs\n"
-        "| Metric | Target |\n"
-        "|--------|--------|\n"
-        "| Availability | X% |\n"
-        "| Latency P99 | Yms |\n\n"
-        "## Alert Response\n"
-        "### SERVICE_NAMELatencyP99High\n"
-        "**Severity**: warning | **Threshold**: ... \n"
-        "**Steps**: 1. Check... 2. Scale... 3. Escalate...\n\n"
-        "## Kubernetes Commands\n"
-        "```bash\n"
-        "kubectl get pods -l app=SERVICE_NAME -n online-boutique\n"
-        "kubectl logs -l app=SERVICE_NAME -n online-boutique --tail=100\n"
-        "kubectl rollout restart deployment/SERVICE_NAME -n online-boutique\n"
-        "```\n\n"
-        "## Dependencies\n"
-        "...\n\n"
-        "## Escalation\n"
-        "1. On-call: CHANNEL\n"
-        "2. Team lead: OWNER\n"
-        "```\n"
-    )
 
-    reqs = (
-        "## Requirements\n\n"
-        "1. Include all SLO targets from the service context\n"
-        "2. List every risk with its priority and mitigation\n"
-        "3. Include kubectl commands for: pod status, logs, restart, "
-        "describe, top\n"
-        "4. Alert response section for each alert type "
-        "(latency, error rate)\n"
-        "5. Dependency health checks: how to verify each upstream is OK\n"
-        "6. Escalation path using the service's alertChannels\n"
-    )
+def build_single_service_runbook_prompt(ctx: Dict) -> str:
+    """Build runbook prompt for a single service."""
+    return build_single_service_prompt(ARTIFACT_RUNBOOKS, ctx)
 
-    return (
-        f"{header}\n\n## Services\n\n{_services_section(ctxs)}\n\n"
-        f"{template}\n{reqs}\n"
-        f"{_output_format_section(n, 'RUNBOOK', ctxs)}"
-    )
 
+# =============================================================================
+# PROMPT CACHE SEGMENTS
+# =============================================================================
+# Artifact prompts start with one of these stable prefixes. Splitting there
+# lets an LLM client mark the prefix as cacheable, e.g. as an Anthropic
+# content block with cache_control={"type": "ephemeral"}.
 
-def build_single_service_runbook_prompt(ctx: Dict) -> str:
-    """Build runbook prompt for a single service."""
-    service_name = ctx["name"]
-    tier = ctx["criticality"]
-    header = (
-        f"Generate 1 operational runbook in Markdown for "
-        f"the {service_name} microservice ({tier} criticality).\n\n"
-        "The runbook covers: service overview, SLOs, alert response, "
-        "K8s commands, dependencies, risks, and escalation."
-    )
+_STABLE_PREFIXES = tuple(sorted(
+    {spec.prefix for spec in _ARTIFACT_PROMPTS.values()},
+    key=len, reverse=True,
+))
 
-    template = (
-        "## Reference Template\n\n"
-        "```markdown\n"
-        "# SERVICE_NAME Operational Runbook\n\n"
-        "## Service Overview\n"
-        "| Field | Value |\n"
-        "|-------|-------|\n"
-        "| Language | LANG |\n"
-        "| Criticality | TIER |\n"
-        "| Owner | OWNER |\n"
-        "| Port | PORT |\n\n"
-        "## SLOs\n"
-        "| Metric | Target |\n"
-        "|--------|--------|\n"
-        "| Availability | X% |\n"
-        "| Latency P99 | Yms |\n\n"
-        "## Alert Response\n"
-        "### SERVICE_NAMELatencyP99High\n"
-        "**Severity**: warning | **Threshold**: ... \n"
-        "**Steps**: 1. Check... 2. Scale... 3. Escalate...\n\n"
-        "## Kubernetes Commands\n"
-        "```bash\n"
-        "kubectl get pods -l app=SERVICE_NAME -n online-boutique\n"
-        "kubectl logs -l app=SERVICE_NAME -n online-boutique --tail=100\n"
-        "kubectl rollout restart deployment/SERVICE_NAME -n online-boutique\n"
-        "```\n\n"
-        "## Dependencies\n"
-        "...\n\n"
-        "## Escalation\n"
-        "1. On-call: CHANNEL\n"
-        "2. Team lead: OWNER\n"
-        "```\n"
-    )
 
-    reqs = (
-        "## Requirements\n\n"
-        "1. Include all SLO targets from the service context\n"
-        "2. List every risk with its priority and mitigation\n"
-        "3. Include kubectl commands for: pod status, logs, restart, "
-        "describe, top\n"
-        "4. Alert response section for each alert type "
-        "(latency, error rate)\n"
-        "5. Dependency health checks: how to verify each upstream is OK\n"
-        "6. Escalation path using the service's alertChannels\n"
-    )
+def prompt_segments(prompt: str) -> List[PromptSegment]:
+    """Split a prompt into its cacheable stable prefix and per-call rest.
 
-    return (
-        f"{header}\n\n## Service\n\n{_format_service_block(ctx, 1)}\n\n"
-        f"{template}\n{reqs}\n"
-        f"{_output_format_section(1, 'RUNBOOK', [ctx])}"
-    )
+    Prompts without a known stable prefix come back as a single
+    non-cacheable segment; joining the segment texts always gives back
+    the original prompt.
+    """
+    prompt = str(prompt)
+    for prefix in _STABLE_PREFIXES:
+        if prompt.startswith(prefix):
+            return [
+                {"text": prefix, "cache": True},
+                {"text": prompt[len(prefix):], "cache": False},
+            ]
+    return [{"text": prompt, "cache": False}]
+
+
+# blake2b digest of each stable prefix, recorded on task state so changes
+# to a prefix (which invalidate provider caches) are easy to spot
+_PREFIX_DIGESTS = {
+    prefix: hashlib.blake2b(prefix.encode(), digest_size=16).hexdigest()
+    for prefix in _STABLE_PREFIXES
+}
+
+
+def prompt_prefix_digest(prompt: str) -> Optional[str]:
+    """Return the digest of a prompt's stable prefix, or None if it has none."""
+    head = prompt_segments(prompt)[0]
+    return _PREFIX_DIGESTS[head["text"]] if head["cache"] else None
+
+
+def cache_control_blocks(
+    segments: List[PromptSegment],
+) -> List[Dict[str, Any]]:
+    """Convert prompt segments into Anthropic-style text content blocks."""
+    blocks = []
+    for segment in segments:
+        block: Dict[str, Any] = {"type": "text", "text": segment["text"]}
+        if segment["cache"]:
+            block["cache_control"] = {"type": "ephemeral"}
+        blocks.append(block)
+    return blocks
 
 
 # =============================================================================
 # UTILITY PROMPT BUILDERS (load, verify, summary)
 # =============================================================================
+# These depend only on module-level configuration, so each is built once and
+# cached. Call <builder>.cache_clear() after changing OUTPUT_DIR/_OUTPUT_STR.
 
 
+@functools.lru_cache(maxsize=1)
 def build_load_prompt() -> str:
     """Prompt for importing generated artifacts to the Grafana stack."""
-    output = str(OUTPUT_DIR)
+    output = _OUTPUT_STR
     return (
         "Import all generated observability artifacts to the local "
         "Grafana/observability stack.\n\n"
         f"## Artifact Directory\n\n{output}\n\n"
         "## Steps\n\n"
         "### 1. Import Grafana Dashboards\n"
-        f"For each JSON file in {output}/dashboards/:\n"
+        f"Import every JSON file in {output}/dashboards/ with a single curl "
+        "process; operations separated by `next` reuse one keep-alive "
+        "connection to Grafana:\n"
         "```bash\n"
-        "for f in " + output + "/dashboards/*.json; do\n"
-        '  echo "Importing $(basename $f)..."\n'
-        "  DASH=$(cat \"$f\")\n"
-        "  curl -s -X POST -H 'Content-Type: application/json' "
-        "-u admin:admin \\\n"
-        '    -d "{\\\"dashboard\\\": $DASH, \\\"overwrite\\\": true}" \\\n'
-        "    http://localhost:3000/api/dashboards/db\n"
-        "done\n"
+        "tmp=$(mktemp -d)\n"
+        "trap 'rm -rf \"$tmp\"' EXIT\n"
+        f"for f in {output}/dashboards/*.json; do\n"
+        '  body="$tmp/$(basename "$f")"\n'
+        """  printf '{"dashboard": %s, "overwrite": true}' "$(cat "$f")" """
+        '> "$body"\n'
+        "  printf 'next\\nurl = \"http://localhost:3000/api/dashboards/db\"\\n"
+        "header = \"Content-Type: application/json\"\\n"
+        "user = \"admin:admin\"\\ndata = \"@%s\"\\noutput = \"/dev/null\"\\n"
+        "write-out = \"%%{http_code} %s\\\\n\"\\n' "
+        '"$body" "$(basename "$f")"\n'
+        "done | tail -n +2 | curl -s --config -\n"
         "```\n\n"
         "### 2. Validate PrometheusRules\n"
         f"For each YAML in {output}/prometheus-rules/:\n"
@@ -1129,20 +1335,18 @@ def build_load_prompt() -> str:
     )
 
 
+@functools.lru_cache(maxsize=1)
 def build_verify_prompt() -> str:
     """Prompt for verifying artifact completeness and correctness."""
-    output = str(OUTPUT_DIR)
-    services_no_lg = [s for s in SERVICE_INFO if s != "loadgenerator"]
-    all_services = list(SERVICE_INFO.keys())
-
+    output = _OUTPUT_STR
     return (
         "Verify all observability artifacts were generated and loaded.\n\n"
         f"## Artifact Directory\n\n{output}\n\n"
         "## Checks\n\n"
         "### 1. File Existence\n"
-        f"Dashboard JSON files for all 11 services: {', '.join(all_services)}\n"
+        f"Dashboard JSON files for all 11 services: {_ALL_SERVICES_CSV}\n"
         f"PrometheusRule YAMLs for 10 services (no loadgenerator): "
-        f"{', '.join(services_no_lg)}\n"
+        f"{_SERVICES_NO_LG_CSV}\n"
         "SLO YAMLs for 10 services\n"
         "Notification policy YAMLs for 10 services\n"
         "Loki rule YAMLs for 10 services\n"
@@ -1186,6 +1390,7 @@ def build_verify_prompt() -> str:
     )
 
 
+@functools.lru_cache(maxsize=1)
 def build_summary_prompt() -> str:
     """Prompt for generating the final execution report."""
     return (
@@ -1225,6 +1430,27 @@ def build_summary_prompt() -> str:
 # TASK GENERATION
 # =============================================================================
 
+
+class LazyPrompt:
+    """Prompt text rendered on first use.
+
+    Task generation stores one of these per artifact task so callers that
+    never read the prompt (--list, phase filtering) skip rendering it.
+    str() renders once and returns the cached text thereafter.
+    """
+
+    __slots__ = ("fn", "_value")
+
+    def __init__(self, fn: Callable[[], str]):
+        self.fn = fn
+        self._value: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self._value is None:
+            self._value = self.fn()
+        return self._value
+
+
 # Map artifact key to prompt builder function (batched, multi-service)
 _PROMPT_BUILDERS = {
     "DASHBOARDS": build_dashboard_prompt,
@@ -1237,6 +1463,16 @@ _PROMPT_BUILDERS = {
     "RUNBOOK": build_runbook_prompt,
 }
 
+# TIER_CONFIGS flattened at import into one work item per batched task:
+# (tier_name, task_id, phase, gate_deps, artifact_title, artifact_key)
+_BATCHED_WORK_ITEMS: Tuple[Tuple[Any, ...], ...] = tuple(
+    (tc["name"], f"OB-{tc['prefix']}-{artifact_key}", tc["phase"],
+     tc["gate_deps"], ARTIFACT_TITLES.get(artifact_key, artifact_key),
+     artifact_key)
+    for tc in TIER_CONFIGS
+    for artifact_key in tc["artifacts"]
+)
+
 # Map artifact key to single-service prompt builder function
 _SINGLE_SERVICE_PROMPT_BUILDERS = {
     "DASHBOARDS": build_single_service_dashboard_prompt,
@@ -1249,6 +1485,12 @@ _SINGLE_SERVICE_PROMPT_BUILDERS = {
     "RUNBOOK": build_single_service_runbook_prompt,
 }
 
+# Decomposed dispatch table: artifact key -> (title, single-service builder)
+_SINGLE_ARTIFACT_META: Dict[str, Tuple[str, Optional[Callable[[Dict], str]]]] = {
+    key: (ARTIFACT_TITLES.get(key, key), _SINGLE_SERVICE_PROMPT_BUILDERS.get(key))
+    for key in (*STANDARD_ARTIFACTS, *LOADGEN_ARTIFACTS)
+}
+
 # Phase assignment by tier for per-service task decomposition
 _TIER_TO_PHASE = {
     "critical": 1,
@@ -1258,6 +1500,29 @@ _TIER_TO_PHASE = {
 }
 
 
+def _make_batched_task(
+    work_item: Tuple[Any, ...],
+    n: int,
+    services_block: str,
+    names: str,
+) -> Dict[str, Any]:
+    """Build one tier-batched artifact task dict from a work item."""
+    (tier_name, task_id, phase, gate_deps,
+     artifact_title, artifact_key) = work_item
+    return {
+        "id": task_id,
+        "title": f"Generate {n} {artifact_title} ({tier_name} tier)",
+        "type": "task",
+        "phase": phase,
+        "depends_on": gate_deps,
+        "package": "all",
+        "prompt": LazyPrompt(functools.partial(
+            build_batched_prompt,
+            artifact_key, tier_name, n, services_block, names,
+        )),
+    }
+
+
 def _generate_batched_tasks(
     contexts: Dict[str, Dict],
     tiers: Dict[str, List[Dict]],
@@ -1266,43 +1531,39 @@ def _generate_batched_tasks(
 
     Returns (tasks, all_artifact_ids).
     """
-    tasks: List[Dict[str, Any]] = []
-    all_artifact_ids: List[str] = []
-
+    # Per-tier prompt inputs, rendered once and shared by the tier's artifacts.
+    # Tiers with no services are skipped rather than given empty prompts.
+    tier_inputs: Dict[str, Tuple[int, str, str]] = {}
     for tc in TIER_CONFIGS:
-        tier_name = tc["name"]
-        tier_ctxs = tiers.get(tier_name, [])
-        n = len(tier_ctxs)
+        tier_ctxs = tiers.get(tc["name"], [])
+        if not tier_ctxs:
+            continue
+        tier_inputs[tc["name"]] = (
+            len(tier_ctxs),
+            _services_section(tier_ctxs),
+            _service_names_csv(tier_ctxs),
+        )
 
-        for artifact_key in tc["artifacts"]:
-            task_id = f"OB-{tc['prefix']}-{artifact_key}"
-            artifact_title = ARTIFACT_TITLES.get(artifact_key, artifact_key)
+    tasks = [
+        _make_batched_task(item, *tier_inputs[item[0]])
+        for item in _BATCHED_WORK_ITEMS
+        if item[0] in tier_inputs
+    ]
 
-            builder = _PROMPT_BUILDERS.get(artifact_key)
-            if builder:
-                prompt = builder(tier_name, tier_ctxs)
-            else:
-                prompt = f"Generate {artifact_title} for {tier_name} tier."
-
-            tasks.append({
-                "id": task_id,
-                "title": (
-                    f"Generate {n} {artifact_title} ({tier_name} tier)"
-                ),
-                "type": "task",
-                "phase": tc["phase"],
-                "depends_on": list(tc["gate_deps"]),
-                "package": "all",
-                "prompt": prompt,
-            })
-
-            all_artifact_ids.append(task_id)
+    # Drop gates on skipped tiers, matching decomposed mode where an empty
+    # tier contributes no dashboard dependencies.
+    if len(tier_inputs) < len(TIER_CONFIGS):
+        task_ids = {task["id"] for task in tasks}
+        for task in tasks:
+            task["depends_on"] = tuple(
+                d for d in task["depends_on"] if d in task_ids
+            )
 
-    return tasks, all_artifact_ids
+    return tasks, [task["id"] for task in tasks]
 
 
 def _generate_decomposed_tasks(
-    contexts: Dict[str, Dict],
+    contexts: Mapping[str, Dict],
 ) -> Tuple[List[Dict[str, Any]], List[str]]:
     """Generate 1 task per service (decomposed mode).
 
@@ -1315,11 +1576,9 @@ def _generate_decomposed_tasks(
     tasks: List[Dict[str, Any]] = []
     all_artifact_ids: List[str] = []
 
-    # Track dashboard task IDs per tier for phase gating.
+    # Track dashboard task IDs per tier for phase gating, in tier order.
     # All critical services must complete their dashboards before high starts, etc.
-    tier_dashboard_ids: Dict[str, List[str]] = {
-        "critical": [], "high": [], "medium": [], "low": []
-    }
+    tier_dashboard_ids: List[List[str]] = []
 
     # Process services in tier order to ensure dependencies are populated
     # correctly. Within each tier, sort alphabetically for deterministic output.
@@ -1329,9 +1588,21 @@ def _generate_decomposed_tasks(
         services_in_tier = sorted(TIER_MAP.get(tier, []))
         phase = _TIER_TO_PHASE.get(tier, 3)
 
+        # Dependencies: tier-level gating on dashboard artifacts
+        # - Critical tier (phase 1): no dependencies
+        # - High tier (phase 2): depends on all critical dashboards
+        # - Medium tier (phase 3): depends on all high dashboards
+        # - Low tier (phase 4): depends on all medium dashboards
+        # The previous tier is complete by now, so one tuple is shared by
+        # every task in the tier (as with gate_deps in batched mode).
+        tier_deps = tuple(tier_dashboard_ids[-1]) if tier_dashboard_ids else ()
+        dashboard_ids: List[str] = []
+        tier_dashboard_ids.append(dashboard_ids)
+
         for service_name in services_in_tier:
-            ctx = contexts.get(service_name)
-            if not ctx:
+            # Membership only: a _LazyContexts mapping answers this without
+            # loading data sources, which happens when a prompt is rendered
+            if service_name not in contexts:
                 continue
 
             # Choose artifact list based on service
@@ -1340,38 +1611,25 @@ def _generate_decomposed_tasks(
             else:
                 artifacts = STANDARD_ARTIFACTS
 
+            id_prefix = f"OB-{service_name.upper()}-"
             for artifact_key in artifacts:
                 # Task ID: OB-{SERVICE}-{ARTIFACT}
                 # e.g., OB-FRONTEND-DASHBOARDS, OB-CHECKOUTSERVICE-ALERTS
-                task_id = f"OB-{service_name.upper()}-{artifact_key}"
-                artifact_title = ARTIFACT_TITLES.get(artifact_key, artifact_key)
-
-                # Get single-service prompt builder
-                builder = _SINGLE_SERVICE_PROMPT_BUILDERS.get(artifact_key)
+                task_id = id_prefix + artifact_key
+                artifact_title, builder = _SINGLE_ARTIFACT_META[artifact_key]
                 if builder:
-                    prompt = builder(ctx)
+                    prompt = LazyPrompt(functools.partial(
+                        _service_prompt, builder, contexts, service_name,
+                    ))
                 else:
                     prompt = f"Generate {artifact_title} for {service_name}."
 
-                # Dependencies: tier-level gating on dashboard artifacts
-                # - Critical tier (phase 1): no dependencies
-                # - High tier (phase 2): depends on all critical dashboards
-                # - Medium tier (phase 3): depends on all high dashboards
-                # - Low tier (phase 4): depends on all medium dashboards
-                depends_on: List[str] = []
-                if tier == "high":
-                    depends_on = list(tier_dashboard_ids["critical"])
-                elif tier == "medium":
-                    depends_on = list(tier_dashboard_ids["high"])
-                elif tier == "low":
-                    depends_on = list(tier_dashboard_ids["medium"])
-
                 tasks.append({
                     "id": task_id,
                     "title": f"Generate {artifact_title} for {service_name}",
                     "type": "task",
                     "phase": phase,
-                    "depends_on": depends_on,
+                    "depends_on": tier_deps,
                     "package": "all",
                     "prompt": prompt,
                     "service_name": service_name,  # For runner to extract
@@ -1381,31 +1639,47 @@ def _generate_decomposed_tasks(
 
                 # Track dashboard task IDs for tier gating
                 if artifact_key in (ARTIFACT_DASHBOARDS, ARTIFACT_DASHBOARD):
-                    tier_dashboard_ids[tier].append(task_id)
+                    dashboard_ids.append(task_id)
 
     return tasks, all_artifact_ids
 
 
-def generate_observability_tasks() -> List[Dict[str, Any]]:
-    """Build the full observability task list with dependency graph.
+def _service_prompt(
+    builder: Callable[[Dict], str], contexts: Mapping[str, Dict], name: str,
+) -> str:
+    """Render a single-service prompt, resolving its context at render time."""
+    return builder(contexts[name])
 
-    When DECOMPOSE_TO_SINGLE_SERVICE=True (default), generates 1 task per
-    service per artifact type. This avoids truncation issues with GPT-4o-mini
-    by keeping each task's output small (~36 lines per service).
 
-    When DECOMPOSE_TO_SINGLE_SERVICE=False, batches services by tier
-    (original behavior, fewer but larger tasks).
+class _LazyContexts(Mapping[str, Dict]):
+    """Service contexts that load the data sources on first value access.
 
-    Task count formula (decomposed mode):
-        (num_standard_services × num_standard_artifacts) +
-        (num_loadgen_services × num_loadgen_artifacts) +
-        num_utility_tasks
+    Keys come from SERVICE_INFO, so decomposed task generation can lay out
+    every per-service task (ids, dependencies, layers) without parsing any
+    CRD, proto, or manifest. Runs that filter out the artifact phases never
+    render those prompts and so never load the data sources.
+    """
 
-    Tier phases run sequentially (cost control); tasks within a tier
-    run in parallel.
+    def __getitem__(self, name: str) -> Dict:
+        return build_all_contexts()[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in SERVICE_INFO
+
+    def __iter__(self):
+        return iter(SERVICE_INFO)
+
+    def __len__(self) -> int:
+        return len(SERVICE_INFO)
+
+
+@functools.lru_cache(maxsize=1)
+def _build_task_list() -> Tuple[Mapping[str, Any], ...]:
+    """Build the task list once; callers receive copies of each task.
+
+    Cached tasks are read-only views, so a caller cannot alter the shared
+    copy by mistake.
     """
-    contexts = build_all_contexts()
-    tiers = group_by_tier(contexts)
 
     tasks: List[Dict[str, Any]] = []
     all_artifact_ids: List[str] = []
@@ -1416,7 +1690,7 @@ def generate_observability_tasks() -> List[Dict[str, Any]]:
         "title": "Online Boutique Observability Artifact Generation",
         "type": "epic",
         "phase": 0,
-        "depends_on": [],
+        "depends_on": (),
         "package": "all",
         "prompt": (
             "Epic container for observability artifact generation across "
@@ -1428,11 +1702,13 @@ def generate_observability_tasks() -> List[Dict[str, Any]]:
 
     # Phases 1-4: Artifact generation (batched or decomposed)
     if DECOMPOSE_TO_SINGLE_SERVICE:
-        artifact_tasks, all_artifact_ids = _generate_decomposed_tasks(contexts)
+        artifact_tasks, all_artifact_ids = _generate_decomposed_tasks(
+            _LazyContexts()
+        )
         mode_info = f"decomposed mode: {len(artifact_tasks)} tasks (1 per service per artifact)"
     else:
         artifact_tasks, all_artifact_ids = _generate_batched_tasks(
-            contexts, tiers
+            build_all_contexts(), _all_tiers()
         )
         mode_info = f"batched mode: {len(artifact_tasks)} tasks (grouped by tier)"
 
@@ -1448,7 +1724,7 @@ def generate_observability_tasks() -> List[Dict[str, Any]]:
         "title": "Import observability artifacts to Grafana stack",
         "type": "task",
         "phase": 5,
-        "depends_on": list(all_artifact_ids),
+        "depends_on": tuple(all_artifact_ids),
         "package": "spider",
         "prompt": build_load_prompt(),
     })
@@ -1459,7 +1735,7 @@ def generate_observability_tasks() -> List[Dict[str, Any]]:
         "title": "Verify artifact generation and loading",
         "type": "task",
         "phase": 5,
-        "depends_on": ["OB-LOAD"],
+        "depends_on": ("OB-LOAD",),
         "package": "spider",
         "prompt": build_verify_prompt(),
     })
@@ -1470,11 +1746,76 @@ def generate_observability_tasks() -> List[Dict[str, Any]]:
         "title": "Generate execution summary and coverage report",
         "type": "task",
         "phase": 6,
-        "depends_on": ["OB-VERIFY"],
+        "depends_on": ("OB-VERIFY",),
         "package": "all",
         "prompt": build_summary_prompt(),
     })
 
+    _assign_phase_layers(tasks)
+    return tuple(MappingProxyType(task) for task in tasks)
+
+
+def _assign_phase_layers(tasks: List[Dict[str, Any]]) -> None:
+    """Set each task's "phase_layer" to its depth in the dependency graph.
+
+    Layer 0 has no dependencies inside the list; every task in layer k
+    depends only on tasks in lower layers, so a runner can dispatch a layer
+    at a time without re-deriving the graph. Layered Kahn sort, O(T + E).
+    """
+    by_id = {task["id"]: task for task in tasks}
+    indegree = {task["id"]: 0 for task in tasks}
+    dependents: Dict[str, List[str]] = {task["id"]: [] for task in tasks}
+    for task in tasks:
+        for dep in task["depends_on"]:
+            if dep in by_id:
+                indegree[task["id"]] += 1
+                dependents[dep].append(task["id"])
+
+    layer = [tid for tid, deg in indegree.items() if deg == 0]
+    depth = 0
+    while layer:
+        next_layer = []
+        for tid in layer:
+            by_id[tid]["phase_layer"] = depth
+            for child in dependents[tid]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    next_layer.append(child)
+        layer = next_layer
+        depth += 1
+
+
+def generate_observability_tasks(
+    force_render: bool = True,
+) -> List[Dict[str, Any]]:
+    """Build the full observability task list with dependency graph.
+
+    When DECOMPOSE_TO_SINGLE_SERVICE=True (default), generates 1 task per
+    service per artifact type. This avoids truncation issues with GPT-4o-mini
+    by keeping each task's output small (~36 lines per service).
+
+    When DECOMPOSE_TO_SINGLE_SERVICE=False, batches services by tier
+    (original behavior, fewer but larger tasks).
+
+    Task count formula (decomposed mode):
+        (num_standard_services × num_standard_artifacts) +
+        (num_loadgen_services × num_loadgen_artifacts) +
+        num_utility_tasks
+
+    Tier phases run sequentially (cost control); tasks within a tier
+    run in parallel.
+
+    Artifact prompts are built as LazyPrompt objects; with force_render=True
+    (default) they are rendered to plain strings before returning.
+
+    The task list is cached (see clear_context_cache()). Each call returns
+    fresh top-level task dicts, but nested values such as depends_on are
+    shared and should be treated as read-only.
+    """
+    tasks = [dict(task) for task in _build_task_list()]
+    if force_render:
+        for task in tasks:
+            task["prompt"] = str(task["prompt"])
     return tasks
 
 
@@ -1483,23 +1824,29 @@ def generate_observability_tasks() -> List[Dict[str, Any]]:
 # =============================================================================
 
 
-def generate_trace_id() -> str:
-    """Generate a valid 32-character trace ID."""
-    return uuid.uuid4().hex
-
-
-def generate_span_id() -> str:
-    """Generate a valid 16-character span ID."""
-    return uuid.uuid4().hex[:16]
+def _bulk_ids(n: int) -> List[Tuple[str, str]]:
+    """Generate n (trace_id, span_id) pairs from a single urandom read."""
+    buf = os.urandom(24 * n)
+    return [
+        (buf[i:i + 16].hex(), buf[i + 16:i + 24].hex())
+        for i in range(0, 24 * n, 24)
+    ]
 
 
 def create_task_json(
-    task: Dict[str, Any], parent_span_id: str = None,
+    task: Dict[str, Any], parent_span_id: str = None, now: str = None,
+    ids: Optional[Tuple[str, str]] = None,
 ) -> Dict[str, Any]:
-    """Create a ContextCore task state JSON structure."""
-    now = datetime.now(timezone.utc).isoformat()
-    trace_id = generate_trace_id()
-    span_id = generate_span_id()
+    """Create a ContextCore task state JSON structure.
+
+    now is the ISO-8601 start time and ids a (trace_id, span_id) pair;
+    callers creating a batch of tasks pass one shared timestamp and IDs
+    from _bulk_ids(). Both default to fresh values.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc).isoformat()
+    trace_id, span_id = ids if ids is not None else _bulk_ids(1)[0]
+    prompt = str(task["prompt"])
 
     return {
         "task_id": task["id"],
@@ -1517,9 +1864,11 @@ def create_task_json(
             "task.priority": (
                 "high" if task["phase"] <= 2 else "medium"
             ),
-            "task.prompt": task["prompt"],
+            "task.prompt": prompt,
+            "task.prompt_prefix_hash": prompt_prefix_digest(prompt),
             "task.depends_on": task["depends_on"],
             "task.phase": task["phase"],
+            "task.phase_layer": task.get("phase_layer"),
             "task.package": task["package"],
             "project.id": DEMO_PROJECT,
             "sprint.id": DEMO_SPRINT,
@@ -1532,13 +1881,127 @@ def create_task_json(
     }
 
 
+def _encode_task_json(task_json: Any) -> bytes:
+    """Encode a task state document (or list of them) as indented JSON bytes.
+
+    Uses orjson when installed, falling back to the stdlib encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(task_json, option=orjson.OPT_INDENT_2)
+    return json.dumps(task_json, indent=2).encode()
+
+
+def _encode_json(doc: Any) -> bytes:
+    """Encode a document as compact JSON bytes, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(doc)
+    return json.dumps(doc).encode()
+
+
+def _encode_jsonl(docs: List[Dict[str, Any]]) -> bytes:
+    """Encode documents as JSON Lines: one compact document per line."""
+    if orjson is not None:
+        return b"".join(orjson.dumps(doc) + b"\n" for doc in docs)
+    return "".join(json.dumps(doc) + "\n" for doc in docs).encode()
+
+
+def _write_encoded(path: Path, data: bytes) -> None:
+    """Write a pre-encoded payload straight to a raw (unbuffered) file.
+
+    The whole document is already in memory, so skipping BufferedWriter
+    avoids copying it through an intermediate buffer.
+    """
+    with open(path, "wb", buffering=0) as f:
+        view = memoryview(data)
+        while view:
+            view = view[f.write(view):]
+
+
+def _newest_source_mtime() -> float:
+    """Return the newest mtime across task data sources and this script."""
+    newest = Path(__file__).stat().st_mtime
+    for source in (CRD_DIR, K8S_DIR, PROTO_FILE):
+        if source.is_dir():
+            with os.scandir(source) as it:
+                for entry in it:
+                    newest = max(newest, entry.stat().st_mtime)
+        elif source.exists():
+            newest = max(newest, source.stat().st_mtime)
+    return newest
+
+
+def _existing_task_ids() -> set:
+    """Return ids of task files in STATE_DIR using one directory scan."""
+    if not STATE_DIR.exists():
+        return set()
+    with os.scandir(STATE_DIR) as it:
+        return {e.name[:-5] for e in it if e.name.endswith(".json")}
+
+
+def _clear_state_dir() -> None:
+    """Remove everything in STATE_DIR but keep the directory itself.
+
+    The directory is flat (one JSON file per task), so entries are unlinked
+    from one scandir pass instead of rmtree-ing and re-creating it.
+    """
+    with os.scandir(STATE_DIR) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+
+
+def _load_scan_cache() -> Optional[Dict[str, int]]:
+    """Return task id -> phase from the last run if still valid, else None."""
+    try:
+        cache = json.loads(SCAN_CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if (cache.get("decompose") != DECOMPOSE_TO_SINGLE_SERVICE
+            or cache.get("source_mtime", 0) < _newest_source_mtime()):
+        return None
+    return cache.get("tasks")
+
+
+def _write_scan_cache(tasks: List[Dict[str, Any]]) -> None:
+    """Record the generated task ids/phases and source mtime."""
+    cache = {
+        "decompose": DECOMPOSE_TO_SINGLE_SERVICE,
+        "source_mtime": _newest_source_mtime(),
+        "tasks": {t["id"]: t["phase"] for t in tasks},
+    }
+    _write_encoded(SCAN_CACHE_FILE, _encode_task_json(cache))
+
+
+def _setup_header(task_count: int) -> str:
+    """Verbose header printed before per-task progress lines."""
+    return (
+        f"Demo project: {DEMO_PROJECT}\n"
+        f"State directory: {STATE_DIR}\n"
+        f"Tasks to create: {task_count}\n\n"
+    )
+
+
 def setup_demo_tasks(
     phases: List[int] = None,
     dry_run: bool = False,
     clean: bool = False,
     verbose: bool = False,
+    manifest: bool = False,
 ) -> Dict[str, Any]:
-    """Create demo tasks in ContextCore state directory."""
+    """Create demo tasks in ContextCore state directory.
+
+    With manifest=True, all task documents are written to MANIFEST_FILE as
+    JSON Lines in a single write instead of one file per task.
+
+    On re-runs without clean, if SCAN_CACHE_FILE is newer than every data
+    source and all selected tasks already exist, the data sources are not
+    loaded at all and every task is reported as skipped.
+    """
 
     results = {
         "tasks_created": [],
@@ -1546,11 +2009,31 @@ def setup_demo_tasks(
         "errors": [],
         "state_dir": str(STATE_DIR),
     }
+    manifest_docs: List[Dict[str, Any]] = []
+    pending_writes: List[Tuple[Path, bytes]] = []
+    existing = set() if clean or manifest else _existing_task_ids()
+
+    cached = None if clean or manifest else _load_scan_cache()
+    if cached is not None:
+        cached_ids = [
+            tid for tid, phase in cached.items()
+            if not phases or phase in phases or phase == 0
+        ]
+        if existing.issuperset(cached_ids):
+            if verbose:
+                sys.stdout.write(
+                    _setup_header(len(cached_ids))
+                    + "".join(f"  Skipped (exists): {tid}\n" for tid in cached_ids)
+                )
+            results["tasks_skipped"] = cached_ids
+            return results
 
     # Generate the observability task list
-    source_tasks = generate_observability_tasks()
+    # Prompts render lazily, so tasks filtered out below are never rendered
+    all_tasks = generate_observability_tasks(force_render=False)
 
     # Filter tasks by phase if specified
+    source_tasks = all_tasks
     if phases:
         source_tasks = [
             t for t in source_tasks
@@ -1558,17 +2041,14 @@ def setup_demo_tasks(
         ]
 
     if verbose:
-        print(f"Demo project: {DEMO_PROJECT}")
-        print(f"State directory: {STATE_DIR}")
-        print(f"Tasks to create: {len(source_tasks)}")
-        print()
+        sys.stdout.write(_setup_header(len(source_tasks)))
 
     # Clean existing tasks if requested
     if clean and STATE_DIR.exists():
         if dry_run:
             print(f"[DRY RUN] Would remove: {STATE_DIR}")
         else:
-            shutil.rmtree(STATE_DIR)
+            _clear_state_dir()
             print(f"Cleaned: {STATE_DIR}")
 
     # Create state directory
@@ -1578,40 +2058,78 @@ def setup_demo_tasks(
     # Track epic span ID for parent linking
     epic_span_id = None
 
+    # All tasks in one setup run share a single start timestamp, and their
+    # trace/span IDs come from one urandom read
+    now = datetime.now(timezone.utc).isoformat()
+    ids = iter(_bulk_ids(0 if dry_run else len(source_tasks)))
+
+    # Per-task progress lines, emitted with one write after the loop
+    log: List[str] = []
+
     # Create each task
     for task in source_tasks:
         task_file = STATE_DIR / f"{task['id']}.json"
 
-        if task_file.exists() and not clean:
+        if task["id"] in existing:
             results["tasks_skipped"].append(task["id"])
             if verbose:
-                print(f"  Skipped (exists): {task['id']}")
+                log.append(f"  Skipped (exists): {task['id']}\n")
             continue
 
-        parent_span = epic_span_id if task["type"] != "epic" else None
-        task_json = create_task_json(task, parent_span)
-
-        if task["type"] == "epic":
-            epic_span_id = task_json["span_id"]
-
         if dry_run:
+            # Nothing is written, so skip building state (IDs, prompt text)
             deps = (
                 f" (depends: {', '.join(task['depends_on'])})"
                 if task['depends_on'] else ""
             )
-            print(f"[DRY RUN] Phase {task['phase']}: {task['id']}")
-            print(f"          {task['title']}{deps}")
-            print()
+            log.append(
+                f"[DRY RUN] Phase {task['phase']}: {task['id']}\n"
+                f"          {task['title']}{deps}\n\n"
+            )
+            continue
+
+        parent_span = epic_span_id if task["type"] != "epic" else None
+        task_json = create_task_json(task, parent_span, now, next(ids))
+
+        if task["type"] == "epic":
+            epic_span_id = task_json["span_id"]
+
+        if manifest:
+            manifest_docs.append(task_json)
         else:
-            with open(task_file, 'w') as f:
-                json.dump(task_json, f, indent=2)
-            results["tasks_created"].append(task["id"])
-            if verbose:
-                print(f"  Created: {task['id']} - {task['title']}")
+            # Encode first, then hand the whole document over in one write
+            pending_writes.append((task_file, _encode_task_json(task_json)))
+        results["tasks_created"].append(task["id"])
+        if verbose:
+            log.append(f"  Created: {task['id']} - {task['title']}\n")
+
+    if pending_writes:
+        # Files are independent, so overlap the open/write/close syscalls
+        workers = min(len(pending_writes), 8)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda item: _write_encoded(*item), pending_writes))
+
+    if manifest_docs:
+        _write_encoded(MANIFEST_FILE, _encode_jsonl(manifest_docs))
+        results["manifest_file"] = str(MANIFEST_FILE)
+
+    if log:
+        sys.stdout.write("".join(log))
+
+    if not dry_run:
+        _write_scan_cache(all_tasks)
+        _save_yaml_cache()
 
     return results
 
 
+_RULE = "=" * 70
+_LIST_BANNER = f"{_RULE}\nOBSERVABILITY ARTIFACT GENERATION TASKS\n{_RULE}\n"
+_SETUP_BANNER = (
+    f"{_RULE}\nOBSERVABILITY ARTIFACT GENERATION: Task Setup\n{_RULE}\n\n"
+)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Set up observability artifact generation tasks",
@@ -1639,62 +2157,81 @@ def main():
         "--list", action="store_true",
         help="List all demo tasks without creating",
     )
+    parser.add_argument(
+        "--manifest", action="store_true",
+        help=f"Write all tasks to a single JSON Lines file "
+             f"({MANIFEST_FILE.name}) instead of one file per task",
+    )
 
     args = parser.parse_args()
 
     if args.list:
-        tasks = generate_observability_tasks()
-        print("=" * 70)
-        print("OBSERVABILITY ARTIFACT GENERATION TASKS")
-        print("=" * 70)
-        print()
+        tasks = generate_observability_tasks(force_render=False)
+        # Collect everything and emit it with a single write
+        parts = [_LIST_BANNER]
         for task in tasks:
             deps = (
                 f" (depends: {', '.join(task['depends_on'])})"
                 if task['depends_on'] else ""
             )
-            print(
+            parts.append(
                 f"Phase {task['phase']}: [{task['package'].upper()}] "
-                f"{task['id']}"
+                f"{task['id']}\n"
+                f"         {task['title']}{deps}\n"
             )
-            print(f"         {task['title']}{deps}")
-            print()
-        print(f"Total: {len(tasks)} tasks")
+        parts.append(f"Total: {len(tasks)} tasks\n")
+        sys.stdout.write("\n".join(parts))
         return
 
-    print("=" * 70)
-    print("OBSERVABILITY ARTIFACT GENERATION: Task Setup")
-    print("=" * 70)
-    print()
+    sys.stdout.write(_SETUP_BANNER)
+
+    if args.verbose and yaml is not None and _SafeLoader is yaml.SafeLoader:
+        print(
+            "Note: PyYAML has no libyaml support; YAML parsing will be slow.\n"
+            "      Reinstall with: pip install --no-binary=pyyaml pyyaml"
+        )
+        print()
 
     results = setup_demo_tasks(
         phases=args.phases,
         dry_run=args.dry_run,
         clean=args.clean,
         verbose=args.verbose or args.dry_run,
+        manifest=args.manifest,
     )
 
-    print()
-    print("-" * 70)
-    print(f"Tasks created: {len(results['tasks_created'])}")
-    print(f"Tasks skipped: {len(results['tasks_skipped'])}")
+    summary = [
+        "",
+        "-" * 70,
+        f"Tasks created: {len(results['tasks_created'])}",
+        f"Tasks skipped: {len(results['tasks_skipped'])}",
+    ]
     if results['errors']:
-        print(f"Errors: {len(results['errors'])}")
-    print(f"State directory: {results['state_dir']}")
-    print()
-
-    if not args.dry_run and results['tasks_created']:
-        print("Next step: Run the demo with:")
-        print("  python demo/run_self_tracking_demo.py")
-        print()
-        print("Or execute via StartD8 SDK directly:")
-        print(
-            f"  python $STARTD8_SDK_ROOT/scripts/"
-            f"run_contextcore_workflow.py \\"
-        )
-        print(
-            f"      --from-contextcore --project-id {DEMO_PROJECT} --yes"
-        )
+        summary.append(f"Errors: {len(results['errors'])}")
+    summary.append(f"State directory: {results['state_dir']}")
+    if results.get("manifest_file"):
+        summary.append(f"Manifest file: {results['manifest_file']}")
+    summary.append("")
+
+    if args.manifest and not args.dry_run:
+        # Nothing here reads the manifest: the runner loads STATE_DIR/*.json
+        summary += [
+            "The manifest is an export only; the demo runner reads one task",
+            "file per task from the state directory. To run the demo, set up",
+            "without --manifest:",
+            "  python demo/setup_demo_tasks.py",
+            "",
+        ]
+    elif not args.dry_run and results['tasks_created']:
+        summary += [
+            "Next step: Run the demo with:",
+            "  python demo/run_self_tracking_demo.py",
+            "",
+            "Or execute via StartD8 SDK directly:",
+            "  python $STARTD8_SDK_ROOT/scripts/run_contextcore_workflow.py \\",
+            f"      --from-contextcore --project-id {DEMO_PROJECT} --yes",
+        ]
+    sys.stdout.write("\n".join(summary) + "\n")
 
 
 if __name__ == "__main__":
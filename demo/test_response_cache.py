@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Unit tests for response_cache.py
+
+Tests cover:
+- Key derivation from artifact type, prompt and agents
+- Round-trip through memory and disk
+- TTL expiry
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add demo directory to path for imports
+_HERE = str(Path(__file__).parent)
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
+
+from response_cache import ResponseCache, cache_key
+
+
+class TestCacheKey(unittest.TestCase):
+    """Test cache key derivation."""
+
+    def test_key_is_stable_and_prefixed(self):
+        key = cache_key("dashboards", "prompt", "lead", "drafter")
+        self.assertEqual(key, cache_key("dashboards", "prompt", "lead", "drafter"))
+        self.assertTrue(key.startswith("dashboards-"))
+
+    def test_key_changes_with_prompt_or_agent(self):
+        key = cache_key("dashboards", "prompt", "lead", "drafter")
+        self.assertNotEqual(key, cache_key("dashboards", "prompt2", "lead", "drafter"))
+        self.assertNotEqual(key, cache_key("dashboards", "prompt", "lead", "other"))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test storing and replaying cached responses."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_put_then_get_from_fresh_instance(self):
+        ResponseCache(self.cache_dir).put("k", "content")
+        self.assertEqual(ResponseCache(self.cache_dir).get("k"), "content")
+
+    def test_missing_key_returns_none(self):
+        self.assertIsNone(ResponseCache(self.cache_dir).get("absent"))
+
+    def test_non_object_entry_returns_none(self):
+        self.cache_dir.joinpath("k.json").write_text("[1, 2]")
+        self.assertIsNone(ResponseCache(self.cache_dir).get("k"))
+
+    def test_expired_entry_returns_none(self):
+        cache = ResponseCache(self.cache_dir, ttl_seconds=60)
+        cache.put("k", "content")
+        with mock.patch("response_cache.time.time", return_value=10 ** 12):
+            self.assertIsNone(cache.get("k"))
+
+
+if __name__ == "__main__":
+    unittest.main()
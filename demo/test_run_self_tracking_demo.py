@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Unit tests for run_self_tracking_demo.py
+
+Tests cover:
+- Propagating skips to dependent tasks
+- Dependency waves for --parallel dispatch
+"""
+
+import contextlib
+import io
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add demo directory to path for imports
+_HERE = str(Path(__file__).parent)
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
+
+from run_self_tracking_demo import (
+    _dependency_waves,
+    _run_in_waves,
+    _transitive_dependents,
+)
+
+
+def _task(task_id, *depends_on):
+    return SimpleNamespace(task_id=task_id, depends_on=list(depends_on), config={})
+
+
+class TestTransitiveDependents(unittest.TestCase):
+    """Test finding the tasks blocked by skipped tasks."""
+
+    def test_dependents_found_through_chain(self):
+        tasks = [
+            _task("OB-VERIFY", "OB-LOAD"),
+            _task("OB-SUMMARY", "OB-VERIFY"),
+            _task("OB-LOAD", "OB-A"),
+            _task("OB-A"),
+            _task("OB-B"),
+        ]
+        self.assertEqual(
+            _transitive_dependents(tasks, ["OB-A"]),
+            ["OB-VERIFY", "OB-SUMMARY", "OB-LOAD"],
+        )
+
+    def test_no_roots_blocks_nothing(self):
+        tasks = [_task("OB-A"), _task("OB-B", "OB-A")]
+        self.assertEqual(_transitive_dependents(tasks, []), [])
+
+
+class TestParallelWaves(unittest.TestCase):
+    """Test wave grouping and failure propagation across waves."""
+
+    def test_waves_follow_phase_layers(self):
+        # Layers put OB-C in a later wave than its dependencies alone would
+        tasks = [_task("OB-B", "OB-A"), _task("OB-A"), _task("OB-C")]
+        layers = {"OB-A": 0, "OB-B": 1, "OB-C": 1}
+        waves = _dependency_waves(tasks, layers)
+        self.assertEqual(
+            [[t.task_id for t in w] for w in waves], [["OB-A"], ["OB-B", "OB-C"]],
+        )
+
+    def test_failed_task_skips_dependents_in_later_waves(self):
+        tasks = [
+            _task("OB-A"),
+            _task("OB-OK"),
+            _task("OB-B", "OB-A"),
+            _task("OB-C", "OB-B"),
+            _task("OB-D", "OB-OK"),
+        ]
+        dispatched = []
+
+        def run_one(task):
+            dispatched.append(task.task_id)
+            result = SimpleNamespace(success=task.task_id != "OB-A")
+            return {task.task_id: result}, {"total_tasks": 1}
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            results, summaries, blocked = _run_in_waves(tasks, run_one, 4, {})
+        self.assertEqual(sorted(dispatched), ["OB-A", "OB-D", "OB-OK"])
+        self.assertEqual(blocked, {"OB-B": "OB-A", "OB-C": "OB-B"})
+        self.assertEqual(len(summaries), 3)
+
+    def test_largest_prompts_start_first_within_wave(self):
+        tasks = [_task("OB-S"), _task("OB-L"), _task("OB-M"), _task("OB-N", "OB-S")]
+        estimates = {"OB-S": 10, "OB-L": 900, "OB-M": 300, "OB-N": 5000}
+        dispatched = []
+
+        def run_one(task):
+            dispatched.append(task.task_id)
+            return {task.task_id: SimpleNamespace(success=True)}, {}
+
+        # One worker runs tasks in submission order
+        _run_in_waves(tasks, run_one, 1, estimates)
+        self.assertEqual(dispatched, ["OB-L", "OB-M", "OB-S", "OB-N"])
+
+
+if __name__ == "__main__":
+    unittest.main()
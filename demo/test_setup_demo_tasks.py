@@ -9,19 +9,43 @@ Tests cover:
 - Service name extraction from task IDs
 """
 
+import contextlib
+import io
+import json
 import os
 import sys
+import tempfile
 import unittest
+from unittest import mock
 from pathlib import Path
 
 # Add demo directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent))
+_HERE = str(Path(__file__).parent)
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
 
+import setup_demo_tasks
 from setup_demo_tasks import (
     generate_observability_tasks,
     _generate_decomposed_tasks,
     _generate_batched_tasks,
     build_all_contexts,
+    build_service_context,
+    load_k8s_manifests,
+    create_task_json,
+    setup_demo_tasks as run_setup,
+    _encode_task_json,
+    clear_context_cache,
+    _services_section,
+    prompt_segments,
+    cache_control_blocks,
+    prompt_prefix_digest,
+    _format_service_block,
+    _service_bodies,
+    build_load_prompt,
+    build_verify_prompt,
+    build_summary_prompt,
+    build_runbook_prompt,
     group_by_tier,
     TIER_MAP,
     SERVICE_TO_TIER,
@@ -31,34 +55,62 @@ from setup_demo_tasks import (
     ARTIFACT_DASHBOARD,
 )
 
+_DASH_SUFFIXES = (ARTIFACT_DASHBOARDS, ARTIFACT_DASHBOARD)
+_UTILITY_IDS = frozenset(("OB-EPIC", "OB-LOAD", "OB-VERIFY", "OB-SUMMARY"))
+
+# 10 standard services × 6 artifacts + 1 loadgenerator × 2 artifacts = 62
+_EXPECTED_DECOMPOSED = (
+    sum(len(s) for t, s in TIER_MAP.items() if t != "low") * len(STANDARD_ARTIFACTS) +
+    len(TIER_MAP.get("low", [])) * len(LOADGEN_ARTIFACTS)
+)
+# 3 standard tiers × 6 artifacts + 1 low tier × 2 artifacts = 20
+_EXPECTED_BATCHED = (
+    sum(1 for t in TIER_MAP if t != "low") * len(STANDARD_ARTIFACTS) +
+    (1 if "low" in TIER_MAP else 0) * len(LOADGEN_ARTIFACTS)
+)
+
+
+def setUpModule():
+    """Point the YAML extraction cache at a temp dir, not ~/.contextcore."""
+    tmp = tempfile.TemporaryDirectory()
+    unittest.addModuleCleanup(tmp.cleanup)
+    patcher = mock.patch.object(
+        setup_demo_tasks, "YAML_CACHE_FILE", Path(tmp.name, "yaml-cache.json"),
+    )
+    patcher.start()
+    unittest.addModuleCleanup(patcher.stop)
+    patcher = mock.patch.object(setup_demo_tasks, "_yaml_cache_pending", None)
+    patcher.start()
+    unittest.addModuleCleanup(patcher.stop)
+
 
 class TestDecomposedTaskGeneration(unittest.TestCase):
     """Tests for per-service task decomposition."""
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Build contexts once for all tests."""
-        self.contexts = build_all_contexts()
-        self.tasks, self.artifact_ids = _generate_decomposed_tasks(self.contexts)
+        cls.contexts = build_all_contexts()
+        cls.tasks, cls.artifact_ids = _generate_decomposed_tasks(cls.contexts)
+        cls.service_of_task = [t.get("service_name") for t in cls.tasks]
+        cls.tier_of_task = [SERVICE_TO_TIER.get(s) for s in cls.service_of_task]
+        cls.tasks_by_tier = {tier: [] for tier in TIER_MAP}
+        for task, tier in zip(cls.tasks, cls.tier_of_task):
+            if tier is not None:
+                cls.tasks_by_tier[tier].append(task)
 
     def test_task_count(self):
         """Verify correct number of tasks generated."""
-        # 10 standard services × 6 artifacts + 1 loadgenerator × 2 artifacts = 62
-        num_standard = sum(
-            len(services) for tier, services in TIER_MAP.items()
-            if tier != "low"
-        )
-        num_loadgen = len(TIER_MAP.get("low", []))
-        expected = (num_standard * len(STANDARD_ARTIFACTS) +
-                    num_loadgen * len(LOADGEN_ARTIFACTS))
-        self.assertEqual(len(self.tasks), expected)
+        self.assertEqual(len(self.tasks), _EXPECTED_DECOMPOSED)
 
     def test_task_id_format(self):
         """Verify task IDs follow OB-{SERVICE}-{ARTIFACT} pattern."""
         for task in self.tasks:
             task_id = task["id"]
-            parts = task_id.split("-", 2)
-            self.assertEqual(parts[0], "OB", f"Task {task_id} should start with OB-")
-            self.assertEqual(len(parts), 3, f"Task {task_id} should have 3 parts")
+            self.assertTrue(task_id.startswith("OB-"),
+                            f"Task {task_id} should start with OB-")
+            self.assertGreaterEqual(task_id.count("-"), 2,
+                                    f"Task {task_id} should have 3 parts")
 
     def test_service_name_in_task(self):
         """Verify service_name field is set in task config."""
@@ -69,11 +121,9 @@ class TestDecomposedTaskGeneration(unittest.TestCase):
     def test_tier_ordering(self):
         """Verify tasks are generated in tier order (critical first)."""
         tier_first_seen = {}
-        for i, task in enumerate(self.tasks):
-            service = task.get("service_name")
-            tier = SERVICE_TO_TIER.get(service)
-            if tier and tier not in tier_first_seen:
-                tier_first_seen[tier] = i
+        for i, tier in enumerate(self.tier_of_task):
+            if tier:
+                tier_first_seen.setdefault(tier, i)
 
         # Critical should appear before high, high before medium, etc.
         tier_order = ["critical", "high", "medium", "low"]
@@ -89,18 +139,15 @@ class TestDecomposedTaskGeneration(unittest.TestCase):
 
     def test_alphabetical_within_tier(self):
         """Verify generated tasks are sorted alphabetically within each tier."""
-        # Group tasks by tier
-        tier_services = {tier: [] for tier in TIER_MAP}
-        for task in self.tasks:
-            service = task.get("service_name")
-            tier = SERVICE_TO_TIER.get(service)
-            if tier:
-                # Only add service on first occurrence (dashboard task)
-                if service not in tier_services[tier]:
-                    tier_services[tier].append(service)
-
-        # Verify each tier's services appear in alphabetical order
-        for tier, services in tier_services.items():
+        for tier, tasks in self.tasks_by_tier.items():
+            # Only add service on first occurrence (dashboard task)
+            services = []
+            seen = set()
+            for task in tasks:
+                service = task["service_name"]
+                if service not in seen:
+                    seen.add(service)
+                    services.append(service)
             self.assertEqual(services, sorted(services),
                              f"Services in {tier} tier should be alphabetically sorted")
 
@@ -108,86 +155,375 @@ class TestDecomposedTaskGeneration(unittest.TestCase):
         """Verify phase 2+ task dependencies reference dashboard tasks."""
         dashboard_task_ids = {
             task["id"] for task in self.tasks
-            if task["id"].endswith(f"-{ARTIFACT_DASHBOARDS}") or
-               task["id"].endswith(f"-{ARTIFACT_DASHBOARD}")
+            if task["id"].rpartition("-")[2] in _DASH_SUFFIXES
         }
-
-        for task in self.tasks:
-            deps = task.get("depends_on", [])
-            if deps:
-                for dep in deps:
-                    self.assertIn(dep, dashboard_task_ids,
-                                  f"Dependency {dep} should be a dashboard task")
+        all_deps = {
+            dep for task in self.tasks for dep in task.get("depends_on", [])
+        }
+        self.assertEqual(all_deps - dashboard_task_ids, set(),
+                         "Dependencies should all be dashboard tasks")
 
     def test_critical_tier_no_dependencies(self):
         """Verify critical tier tasks have no dependencies."""
-        critical_services = set(TIER_MAP.get("critical", []))
-        for task in self.tasks:
-            if task.get("service_name") in critical_services:
-                self.assertEqual(task.get("depends_on", []), [],
-                                 f"Critical tier task {task['id']} should have no dependencies")
+        for task in self.tasks_by_tier.get("critical", []):
+            self.assertEqual(task["depends_on"], (),
+                             f"Critical tier task {task['id']} should have no dependencies")
 
 
 class TestBatchedTaskGeneration(unittest.TestCase):
     """Tests for per-tier task batching (legacy mode)."""
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Build contexts once for all tests."""
-        self.contexts = build_all_contexts()
-        self.tiers = group_by_tier(self.contexts)
-        self.tasks, self.artifact_ids = _generate_batched_tasks(
-            self.contexts, self.tiers
+        cls.contexts = build_all_contexts()
+        cls.tiers = group_by_tier(cls.contexts)
+        cls.tasks, cls.artifact_ids = _generate_batched_tasks(
+            cls.contexts, cls.tiers
         )
 
     def test_task_count(self):
         """Verify correct number of batched tasks."""
-        # 3 standard tiers × 6 artifacts + 1 low tier × 2 artifacts = 20
-        num_standard_tiers = len([t for t in TIER_MAP if t != "low"])
-        num_low_tiers = 1 if "low" in TIER_MAP else 0
-        expected = (num_standard_tiers * len(STANDARD_ARTIFACTS) +
-                    num_low_tiers * len(LOADGEN_ARTIFACTS))
-        self.assertEqual(len(self.tasks), expected)
+        self.assertEqual(len(self.tasks), _EXPECTED_BATCHED)
 
     def test_task_id_format(self):
         """Verify task IDs follow OB-{TIER}-{ARTIFACT} pattern."""
         valid_prefixes = {"CRIT", "HIGH", "MED", "LOW"}
         for task in self.tasks:
             task_id = task["id"]
-            parts = task_id.split("-", 2)
-            self.assertEqual(parts[0], "OB", f"Task {task_id} should start with OB-")
-            self.assertIn(parts[1], valid_prefixes,
+            self.assertTrue(task_id.startswith("OB-"),
+                            f"Task {task_id} should start with OB-")
+            self.assertIn(task_id[3:].partition("-")[0], valid_prefixes,
                           f"Task {task_id} should have valid tier prefix")
 
+    def test_empty_tier_skipped(self):
+        """Verify tiers without services produce no tasks or dangling gates."""
+        tiers = dict(self.tiers, high=[])
+        tasks, _ = _generate_batched_tasks(self.contexts, tiers)
+        task_ids = {t["id"] for t in tasks}
+        self.assertFalse(any(tid.startswith("OB-HIGH-") for tid in task_ids))
+        for task in tasks:
+            for dep in task["depends_on"]:
+                self.assertIn(dep, task_ids)
+
+    def test_public_builder_matches_task_prompt(self):
+        """Verify the (tier_name, ctxs) builders render the task prompts."""
+        prompts = {t["id"]: str(t["prompt"]) for t in self.tasks}
+        self.assertEqual(
+            build_runbook_prompt("critical", self.tiers["critical"]),
+            prompts["OB-CRIT-RUNBOOKS"],
+        )
+
 
 class TestFullTaskGeneration(unittest.TestCase):
     """Tests for the complete generate_observability_tasks() function."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Generate the task list once for the read-only tests."""
+        cls.tasks = generate_observability_tasks()
+        cls.task_ids = {t["id"] for t in cls.tasks}
+        cls.load_task = next(t for t in cls.tasks if t["id"] == "OB-LOAD")
+        cls.artifact_ids = cls.task_ids - _UTILITY_IDS
+
     def test_includes_epic(self):
         """Verify epic task is included."""
-        tasks = generate_observability_tasks()
-        epic_tasks = [t for t in tasks if t["id"] == "OB-EPIC"]
+        epic_tasks = [t for t in self.tasks if t["id"] == "OB-EPIC"]
         self.assertEqual(len(epic_tasks), 1)
         self.assertEqual(epic_tasks[0]["type"], "epic")
 
     def test_includes_utility_tasks(self):
         """Verify load, verify, and summary tasks are included."""
-        tasks = generate_observability_tasks()
-        task_ids = {t["id"] for t in tasks}
-        self.assertIn("OB-LOAD", task_ids)
-        self.assertIn("OB-VERIFY", task_ids)
-        self.assertIn("OB-SUMMARY", task_ids)
+        self.assertIn("OB-LOAD", self.task_ids)
+        self.assertIn("OB-VERIFY", self.task_ids)
+        self.assertIn("OB-SUMMARY", self.task_ids)
 
     def test_load_depends_on_all_artifacts(self):
         """Verify OB-LOAD depends on all artifact tasks."""
-        tasks = generate_observability_tasks()
-        load_task = next(t for t in tasks if t["id"] == "OB-LOAD")
-        artifact_tasks = [
-            t for t in tasks
-            if t["id"] not in ("OB-EPIC", "OB-LOAD", "OB-VERIFY", "OB-SUMMARY")
+        self.assertEqual(set(self.load_task["depends_on"]), self.artifact_ids)
+
+    def test_phase_layers_follow_dependencies(self):
+        """Verify every dependency sits in a strictly lower phase layer."""
+        tasks = generate_observability_tasks(force_render=False)
+        layers = {t["id"]: t["phase_layer"] for t in tasks}
+        for task in tasks:
+            for dep in task["depends_on"]:
+                self.assertLess(layers[dep], layers[task["id"]],
+                                f"{task['id']} must be layered after {dep}")
+
+    def test_returned_tasks_are_independent(self):
+        """Verify mutating a returned task does not leak into later calls."""
+        first = generate_observability_tasks()
+        first[0]["title"] = "changed"
+        second = generate_observability_tasks()
+        self.assertNotEqual(second[0]["title"], "changed")
+        self.assertEqual([t["id"] for t in first], [t["id"] for t in second])
+
+
+class TestServiceContext(unittest.TestCase):
+    """Tests for merging data sources into a service context."""
+
+    def test_risks_normalized(self):
+        """Verify CRD risks are coerced to priority/description dicts."""
+        crd = {"risks": [{"priority": "P1"}, "Redis outage"]}
+        ctx = build_service_context("cartservice", crd, [], None)
+        self.assertEqual(ctx["risks"], [
+            {"priority": "P1", "description": ""},
+            {"priority": "?", "description": "Redis outage"},
+        ])
+
+    def test_contexts_cached_until_cleared(self):
+        """Verify build_all_contexts() is cached and clear_context_cache() resets it."""
+        first = build_all_contexts()
+        self.assertIs(build_all_contexts(), first)
+        clear_context_cache()
+        self.assertIsNot(build_all_contexts(), first)
+
+
+@unittest.skipIf(setup_demo_tasks.yaml is None, "PyYAML not installed")
+class TestManifestLoading(unittest.TestCase):
+    """Tests for parsing K8s manifests from a directory."""
+
+    def test_manifests_parsed_in_order(self):
+        """Verify every manifest is parsed and results keep sorted order."""
+        deployment = (
+            "kind: Deployment\n"
+            "spec:\n"
+            "  template:\n"
+            "    spec:\n"
+            "      containers:\n"
+            "        - ports: [{{containerPort: {port}}}]\n"
+            "          readinessProbe: {{grpc: {{port: {port}}}}}\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            names = ["zeta", "alpha", "mid"]
+            for port, name in enumerate(names, start=7000):
+                Path(tmp, f"{name}.yaml").write_text(
+                    deployment.format(port=port))
+            Path(tmp, "kustomization.yaml").write_text("resources: []\n")
+            with mock.patch.multiple(
+                setup_demo_tasks,
+                K8S_DIR=Path(tmp),
+                YAML_CACHE_FILE=Path(tmp, "cache", "yaml.json"),
+                _yaml_cache_pending=None,
+            ):
+                manifests = load_k8s_manifests()
+                setup_demo_tasks._save_yaml_cache()
+                # Unchanged files are served from the cache without parsing
+                with mock.patch.object(
+                    setup_demo_tasks.yaml, "load_all", side_effect=ValueError,
+                ):
+                    cached = load_k8s_manifests()
+
+        self.assertEqual(list(manifests), sorted(names))
+        self.assertEqual(manifests["zeta"]["port"], 7000)
+        self.assertEqual(manifests["alpha"]["probe_type"], "grpc")
+        self.assertEqual(cached, manifests)
+
+    def test_cache_pruned_and_tied_to_script(self):
+        """Verify removed files leave the cache and a script change drops it."""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_file = Path(tmp, "cache.json")
+            for name in ("a", "b"):
+                Path(tmp, f"{name}.yaml").write_text("kind: Service\n")
+            with mock.patch.multiple(
+                setup_demo_tasks, K8S_DIR=Path(tmp), YAML_CACHE_FILE=cache_file,
+                _yaml_cache_pending=None,
+            ):
+                load_k8s_manifests()
+                Path(tmp, "b.yaml").unlink()
+                load_k8s_manifests()
+                setup_demo_tasks._save_yaml_cache()
+                entries = json.loads(cache_file.read_text())["entries"]
+                script_mtime = Path(setup_demo_tasks.__file__).stat().st_mtime_ns
+                stale = setup_demo_tasks._load_yaml_cache(script_mtime + 1)
+
+        self.assertEqual([Path(k.split(":", 1)[1]).name for k in entries], ["a.yaml"])
+        self.assertEqual(stale, {})
+
+
+class TestProtoParsing(unittest.TestCase):
+    """Tests for extracting service blocks from demo.proto."""
+
+    def test_nested_braces_stay_in_body(self):
+        """Verify rpc option blocks do not end the service body early."""
+        content = (
+            "service CartService {\n"
+            "    rpc AddItem(Req) returns (Empty) {}\n"
+            "    rpc GetCart(Req) returns (Cart) { option (x) = {a: 1}; }\n"
+            "}\n"
+            "message Empty {}\n"
+            "service AdService {\n"
+            "  rpc GetAds(Req) returns (Resp) {}\n"
+            "}\n"
+        )
+        names = [name for name, _ in _service_bodies(content)]
+        self.assertEqual(names, ["CartService", "AdService"])
+        body = next(_service_bodies(content))[1]
+        self.assertIn("GetCart", body)
+        self.assertNotIn("message", body)
+
+
+class TestServicesSection(unittest.TestCase):
+    """Tests for rendering the services section of a prompt."""
+
+    def test_blocks_numbered_in_order(self):
+        """Verify service blocks are joined and numbered in list order."""
+        ctxs = list(build_all_contexts().values()) * 2
+        expected = "\n\n".join(
+            _format_service_block(ctx, i + 1) for i, ctx in enumerate(ctxs)
+        )
+        self.assertEqual(_services_section(ctxs), expected)
+
+    def test_rendering_leaves_contexts_unchanged(self):
+        """Verify cached block rendering never writes into shared contexts."""
+        ctx = build_service_context("cartservice", None, [], None)
+        before = dict(ctx)
+        _services_section([ctx])
+        self.assertEqual(ctx, before)
+
+
+class TestPromptLayout(unittest.TestCase):
+    """Tests for the cache-friendly ordering of artifact prompts."""
+
+    def test_sibling_prompts_share_static_prefix(self):
+        """Verify per-service text only appears after the shared prefix."""
+        tasks = _generate_decomposed_tasks(build_all_contexts())[0]
+        prompts = [
+            str(t["prompt"]) for t in tasks
+            if t["id"].endswith(f"-{ARTIFACT_DASHBOARDS}")
         ]
+        shared = os.path.commonprefix(prompts)
+        self.assertIn("## Requirements", shared)
+        self.assertNotIn("microservice (", shared)
+
+    def test_prompt_segments_split_at_stable_prefix(self):
+        """Verify artifact prompts split into a cached prefix and the rest."""
+        for task in generate_observability_tasks():
+            segments = prompt_segments(task["prompt"])
+            self.assertEqual("".join(s["text"] for s in segments),
+                             task["prompt"])
+            if task["id"] in ("OB-EPIC", "OB-LOAD", "OB-VERIFY", "OB-SUMMARY"):
+                self.assertEqual(len(segments), 1)
+            else:
+                self.assertEqual([s["cache"] for s in segments], [True, False])
+
+    def test_cache_control_blocks_mark_prefix(self):
+        """Verify only the stable prefix block carries cache_control."""
+        prompt = next(
+            t["prompt"] for t in generate_observability_tasks()
+            if t["id"].endswith(f"-{ARTIFACT_DASHBOARDS}")
+        )
+        blocks = cache_control_blocks(prompt_segments(prompt))
+        self.assertEqual(blocks[0]["cache_control"], {"type": "ephemeral"})
+        self.assertNotIn("cache_control", blocks[1])
+
+    def test_prefix_digest_shared_within_family(self):
+        """Verify sibling prompts report the same stable-prefix digest."""
+        digests = {
+            prompt_prefix_digest(t["prompt"])
+            for t in generate_observability_tasks()
+            if t["id"].endswith(f"-{ARTIFACT_DASHBOARDS}")
+        }
+        self.assertEqual(len(digests), 1)
+        self.assertIsNone(prompt_prefix_digest(build_load_prompt()))
+
+
+class TestUtilityPrompts(unittest.TestCase):
+    """Tests for the cached load/verify/summary prompt builders."""
+
+    def test_prompts_are_cached(self):
+        """Verify repeated calls return the same cached string."""
+        for builder in (build_load_prompt, build_verify_prompt,
+                        build_summary_prompt):
+            self.assertIs(builder(), builder())
+
+    def test_cache_clear_rebuilds_identical_prompt(self):
+        """Verify clearing the cache rebuilds an equal prompt."""
+        before = build_load_prompt()
+        build_load_prompt.cache_clear()
+        self.assertEqual(build_load_prompt(), before)
+
+
+class TestTaskState(unittest.TestCase):
+    """Tests for task state JSON construction and encoding."""
+
+    def test_encoded_task_round_trips(self):
+        """Verify encoded task state decodes back to the same document."""
+        task = next(t for t in generate_observability_tasks()
+                    if t["id"] == "OB-LOAD")
+        task_json = create_task_json(task, "0" * 16)
+        decoded = json.loads(_encode_task_json(task_json))
+        self.assertEqual(decoded["attributes"]["task.depends_on"],
+                         list(task["depends_on"]))
+        self.assertEqual(decoded["attributes"]["task.prompt"], task["prompt"])
+
+
+class TestSetupRerun(unittest.TestCase):
+    """Tests for re-running setup against an existing state directory."""
+
+    def test_rerun_skips_generation_when_cache_fresh(self):
+        """Verify an unchanged re-run skips task generation entirely."""
+        with tempfile.TemporaryDirectory() as tmp:
+            state_dir = Path(tmp, "state")
+            with mock.patch.multiple(
+                setup_demo_tasks,
+                STATE_DIR=state_dir,
+                SCAN_CACHE_FILE=Path(tmp, "scan.json"),
+            ):
+                first = run_setup()
+                with mock.patch.object(
+                    setup_demo_tasks, "generate_observability_tasks",
+                    side_effect=AssertionError("tasks regenerated"),
+                ):
+                    second = run_setup()
+                (state_dir / "OB-LOAD.json").unlink()
+                third = run_setup(phases=[5])
+
+        self.assertEqual(second["tasks_created"], [])
+        self.assertEqual(second["tasks_skipped"], first["tasks_created"])
+        self.assertEqual(third["tasks_created"], ["OB-LOAD"])
+
+    def test_dry_run_leaves_yaml_cache_unwritten(self):
+        """Verify a dry run parses data sources without persisting the cache."""
+        setup_demo_tasks.clear_context_cache()
+        self.addCleanup(setup_demo_tasks.clear_context_cache)
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "cartservice.yaml").write_text("kind: Service\n")
+            cache_file = Path(tmp, "yaml.json")
+            with mock.patch.multiple(
+                setup_demo_tasks,
+                STATE_DIR=Path(tmp, "state"),
+                SCAN_CACHE_FILE=Path(tmp, "scan.json"),
+                K8S_DIR=Path(tmp),
+                YAML_CACHE_FILE=cache_file,
+                DECOMPOSE_TO_SINGLE_SERVICE=False,
+                _yaml_cache_pending=None,
+            ):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run_setup(dry_run=True)
+                self.assertFalse(cache_file.exists())
+                run_setup()
+                self.assertTrue(cache_file.exists())
+
+    def test_utility_phases_do_not_load_data_sources(self):
+        """Verify setup limited to phases 5-6 never builds service contexts."""
+        setup_demo_tasks.clear_context_cache()
+        self.addCleanup(setup_demo_tasks.clear_context_cache)
+        with tempfile.TemporaryDirectory() as tmp:
+            with mock.patch.multiple(
+                setup_demo_tasks,
+                STATE_DIR=Path(tmp, "state"),
+                SCAN_CACHE_FILE=Path(tmp, "scan.json"),
+                load_project_contexts=mock.Mock(
+                    side_effect=AssertionError("data sources loaded"),
+                ),
+            ):
+                result = run_setup(phases=[5, 6])
+
         self.assertEqual(
-            set(load_task["depends_on"]),
-            {t["id"] for t in artifact_tasks}
+            result["tasks_created"],
+            ["OB-EPIC", "OB-LOAD", "OB-VERIFY", "OB-SUMMARY"],
         )
 
 